@@ -10,35 +10,100 @@ Output: data/intermediate/po_line_items.csv
 
 Column Operations:
   WRITES: Expected Delivery Date, Location, Main Vendor Name, NIS Level 0 Desc, Ultimate Vendor Name
-  READS:  Main Vendor ID, Plant Code, Ultimate Vendor Number"""
+  READS:  Main Vendor ID, Main Vendor Name, NIS Level 0 Desc, PO Current Supplier Promised Date, Plant Code, Ultimate Vendor Name, Ultimate Vendor Number"""
 import sys
 from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
 import pandas as pd
 from config.column_mappings import EXCLUDED_VALUATION_CLASSES, EXCLUDED_NIS_LEVELS, VENDOR_NAME_MAPPING, PLANT_CODE_TO_LOCATION
+from utils.csv_io import PYARROW_AVAILABLE, read_csv, read_csv_table, table_to_pandas
+from utils.frames import take_rows
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.unit_prices import write_unit_price_sidecar
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_FILE = PROJECT_ROOT / 'data' / 'raw' / 'po line items.csv'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+VALUATION_CLASS_NUM = '_PO Valuation Class num'
+_EXCLUDED_VALUATION_CLASSES = np.array(EXCLUDED_VALUATION_CLASSES, dtype='float64')
+_EXCLUDED_NIS_LEVELS = np.array(EXCLUDED_NIS_LEVELS, dtype=object)
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw CSV file."""
+    """Load the raw CSV file (multi-threaded pyarrow parser when available)."""
     ...
 
-def filter_valuation_classes(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove rows with excluded PO Valuation Classes."""
+def load_filtered_data(filepath: Path) -> pd.DataFrame:
+    """
+    Load the raw CSV without the excluded valuation class / NIS level rows.
+
+    Same result as load_data + add_numeric_valuation_class +
+    filter_excluded_rows (column types are inferred from the whole file), but
+    with pyarrow the rows are dropped from the Arrow table before conversion,
+    so excluded rows never become Python objects and peak memory tracks the
+    kept rows.
+    """
+    ...
+
+def add_numeric_valuation_class(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse PO Valuation Class to numeric once (dropped again before save)."""
+    ...
+
+def _not_in(values: np.ndarray, excluded: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of values not in an exclusion array.
+
+    np.isin runs in C on the raw array. It compares elementwise for short
+    lists like the current ones and switches to a sort-based search if the
+    config grows. pandas' isin builds a hash table per call and is ~100x
+    slower here. NaN matches nothing, so it is kept (same as isin).
+    """
+    ...
+
+def _per_distinct(values: pd.Series, func, na_value) -> np.ndarray:
+    """
+    Evaluate func once per distinct value and broadcast back to every row.
+
+    Low-cardinality text columns (NIS levels, vendor IDs) are factorized to
+    integer codes, so func only sees the handful of unique values; missing
+    values get na_value.
+    """
     ...
 
-def filter_nis_levels(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove rows with excluded NIS Level 0 Desc values."""
+def get_valuation_class_mask(df: pd.DataFrame) -> np.ndarray:
+    """Keep-mask: True where PO Valuation Class is not excluded."""
     ...
 
-def fill_nis_level_for_3021(df: pd.DataFrame) -> pd.DataFrame:
-    """Set NIS Level 0 Desc to 'Materials and Supplies' for Valuation Class 3021 where null."""
+def get_nis_level_mask(df: pd.DataFrame) -> np.ndarray:
+    """Keep-mask: True where NIS Level 0 Desc is not excluded."""
+    ...
+
+def get_excluded_rows_keep_mask(df: pd.DataFrame) -> np.ndarray:
+    """Combined valuation class and NIS level keep-mask (prints removal counts)."""
+    ...
+
+def filter_excluded_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove rows with excluded PO Valuation Classes or NIS Level 0 Desc values.
+
+    The two keep-masks are ANDed first, so the frame is copied once.
+    """
     ...
 
 def transform_nis_column(df: pd.DataFrame) -> pd.DataFrame:
-    """Rename NIS Level 0 Desc to NIS Line and clean up values."""
+    """
+    Fill, normalize and rename NIS Level 0 Desc to NIS Line.
+
+    - Valuation Class 3021 rows with no NIS level get 'Materials and Supplies'
+    - 'Lease and Rent Total' becomes 'Lease and Rent'
+
+    Both fixes are computed from one copy of the column (reusing the parsed
+    valuation class) and written back with a single column assignment.
+    """
+    ...
+
+def _map_vendor_ids(vendor_ids: pd.Series) -> pd.Series:
+    """Look up VENDOR_NAME_MAPPING per distinct vendor ID (NaN where unmapped)."""
     ...
 
 def map_vendor_names(df: pd.DataFrame) -> pd.DataFrame:
@@ -46,7 +111,7 @@ def map_vendor_names(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def map_location(df: pd.DataFrame) -> pd.DataFrame:
-    """Map Plant Code to Location."""
+    """Map Plant Code to Location (looked up once per distinct plant code)."""
     ...
 
 def consolidate_delivery_dates(df: pd.DataFrame) -> pd.DataFrame:
@@ -54,7 +119,7 @@ def consolidate_delivery_dates(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
+    """Save the cleaned DataFrame (CSV, or Parquet if configured)."""
     ...
 
 def main():
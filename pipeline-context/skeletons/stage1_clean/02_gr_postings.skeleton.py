@@ -9,19 +9,24 @@ Input: data/raw/gr table.csv, data/intermediate/po_line_items.csv
 Output: data/intermediate/gr_postings.csv
 
 Column Operations:
-  WRITES: GR Amount, Unit Price
-  READS:  GR Effective Quantity, Ordered Quantity, PO Line ID, Purchase Value USD, Unit Price"""
+  WRITES: GR Amount"""
 import sys
 from pathlib import Path
-import pandas as pd
 SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
+import pandas as pd
+from utils.csv_io import read_csv, write_csv
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.unit_prices import get_lookup_positions, load_unit_price_lookup
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_FILE = PROJECT_ROOT / 'data' / 'raw' / 'gr table.csv'
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv')
+INPUT_COLUMNS = ['PO Line ID', 'GR Posting Date', 'GR Effective Quantity']
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw CSV file."""
+    """Load the raw CSV file (needed columns only, multi-threaded pyarrow parser when available)."""
     ...
 
 def filter_zero_quantity(df: pd.DataFrame) -> pd.DataFrame:
@@ -36,7 +41,7 @@ def calculate_gr_amount(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
+    """Save the cleaned DataFrame (pyarrow CSV writer, or Parquet if configured)."""
     ...
 
 def main():
@@ -9,19 +9,24 @@ Input: data/raw/invoice table.csv, data/intermediate/po_line_items.csv
 Output: data/intermediate/ir_postings.csv
 
 Column Operations:
-  WRITES: Invoice Amount, Unit Price
-  READS:  IR Effective Quantity, Ordered Quantity, PO Line ID, Purchase Value USD, Unit Price"""
+  WRITES: Invoice Amount"""
 import sys
 from pathlib import Path
-import pandas as pd
 SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
+import pandas as pd
+from utils.csv_io import read_csv, write_csv
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.unit_prices import get_lookup_positions, load_unit_price_lookup
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_FILE = PROJECT_ROOT / 'data' / 'raw' / 'invoice table.csv'
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv')
+INPUT_COLUMNS = ['PO Line ID', 'Invoice Posting Date', 'IR Effective Quantity']
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw CSV file."""
+    """Load the raw CSV file (needed columns only, multi-threaded pyarrow parser when available)."""
     ...
 
 def calculate_invoice_amount(df: pd.DataFrame) -> pd.DataFrame:
@@ -32,7 +37,7 @@ def calculate_invoice_amount(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
+    """Save the cleaned DataFrame (pyarrow CSV writer, or Parquet if configured)."""
     ...
 
 def main():
@@ -25,7 +25,9 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
 from config.column_mappings import OPS_DISTRICT_TO_LOCATION
-from utils.xlsx_cache import XlsxCacheManager
+from utils.frames import take_rows
+from utils.text import has_text
+from utils.xlsx_cache import EXCEL_ENGINE, XlsxCacheManager
 PROJECT_ROOT = SCRIPTS_DIR.parent
 RAW_DIR = PROJECT_ROOT / 'data' / 'raw' / 'fdp'
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'wbs_from_projects.csv'
@@ -12,30 +12,43 @@ Reads raw reservations Excel file and performs:
    - Strips leading zeros from line numbers (e.g., "4584632148-00001" -> "4584632148-1")
    - Cleans PO numbers (removes .0 suffix from float conversion)
 
+Caching: Only reprocesses xlsx if:
+- Source file changed (different filename, mtime, or size)
+- Script code changed
+- Use --force to bypass cache
+
 Dependencies: None (independent stage 1 script)
 Input: data/raw/reservations/Data Table - Open Reservation - *.xlsx
 Output: data/intermediate/reservations.csv
 
 Column Operations:
-  WRITES: reservation_line_id, reservation_line_number, reservation_number
-  READS:  Reservation -Line"""
+  WRITES: reservation_line_id, reservation_line_number, reservation_number"""
+import argparse
 import sys
 from pathlib import Path
+from typing import Callable
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
 import pandas as pd
+from utils.frames import take_rows
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.xlsx_cache import EXCEL_ENGINE, XlsxCacheManager, find_latest_xlsx
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_DIR = PROJECT_ROOT / 'data' / 'raw' / 'reservations'
 INPUT_PATTERN = 'Data Table - Open Reservation - Supply Element Availability Status*.xlsx'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'reservations.csv'
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'reservations.csv')
+SOURCE_COLUMNS = ['Reservation -Line', 'Business Line by Profit Center', 'Business Line - By Cost Center', 'Main - PO Line to Peg to Reservation', 'Main - PO to Peg to Reservation', 'Creation Date', 'Requirements Date', 'Material', 'Material Description', 'Open Qty - Reservation', 'Open Reservation Value', 'Combined SOH & PO Pegging', 'Reservation Creation type', 'WBS Element', 'Goods recipient', 'Plant', 'Maximo Asset Num']
 
 def find_input_file() -> Path:
     """Find the reservations input file using glob pattern."""
     ...
 EXCLUDED_MATCHING_BUSINESS_LINES = {'WCM', 'WCF', 'WCD'}
+_EXCLUDED_BUSINESS_LINE_ORDER = sorted(EXCLUDED_MATCHING_BUSINESS_LINES)
+_MISSING_BUSINESS_LINE = -2
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw Excel file."""
+    """Load the raw Excel file (source columns only, in file order)."""
     ...
 
 def split_reservation_line_id(df: pd.DataFrame) -> pd.DataFrame:
@@ -51,6 +64,15 @@ def split_reservation_line_id(df: pd.DataFrame) -> pd.DataFrame:
     """
     ...
 
+def _apply_to_distinct_text(values: pd.Series, func: Callable[[str], str]) -> pd.Series:
+    """
+    Return func(str(value)) per row, with pd.NA where the value is null or "nan".
+
+    PO numbers and PO Line IDs repeat across reservations, so func runs once
+    per distinct value and the results are broadcast through factorize codes.
+    """
+    ...
+
 def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize PO Line IDs to match po_line_items format.
@@ -62,6 +84,16 @@ def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
     """
     ...
 
+def _business_line_codes(values: pd.Series) -> np.ndarray:
+    """
+    Position of each value in _EXCLUDED_BUSINESS_LINE_ORDER after strip/upper.
+
+    -1 where the value is not an excluded business line, _MISSING_BUSINESS_LINE
+    where it is null. Business lines are a handful of codes, so only the
+    distinct values are normalized and rows map through factorize codes.
+    """
+    ...
+
 def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove rows where both Business Line columns have the same value
@@ -72,11 +104,22 @@ def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
+    """
+    Save the cleaned DataFrame (CSV via pandas, or Parquet if configured).
+
+    Not utils.csv_io.write_csv: it writes integral floats without ".0", so a
+    float "Open Qty - Reservation" (e.g. float only because of filtered NaN
+    rows) would read back as int and reach sap_reservations.csv as "5" instead
+    of "5.0". These columns are int or float depending on the source, so a
+    pinned read dtype cannot preserve them either.
+    """
     ...
 
-def main():
+def main(force: bool=False) -> bool:
     ...
 if __name__ == '__main__':
-    success = main()
+    parser = argparse.ArgumentParser(description='Clean SAP reservations export')
+    parser.add_argument('--force', '-f', action='store_true', help='Force processing even if cache is valid')
+    args = parser.parse_args()
+    success = main(force=args.force)
     sys.exit(0 if success else 1)
\ No newline at end of file
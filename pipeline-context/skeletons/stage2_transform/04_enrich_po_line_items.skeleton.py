@@ -16,12 +16,26 @@ Column Operations:
   READS:  ARIBA Shopping cart number, ARIBA shopping cart number : created by (Text), PO Line ID, PO Line Item, PO Number, Purchase Requisition Item, Purchase Requisition Number"""
 import sys
 from pathlib import Path
-import pandas as pd
 SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
+import pandas as pd
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.xlsx_cache import EXCEL_ENGINE
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 PROJECT_ROOT = SCRIPTS_DIR.parent
 PO_DETAILS_FILE = PROJECT_ROOT / 'data' / 'raw' / 'po details report.xlsx'
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
 ENRICHMENT_CACHE_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_details_enrichment.csv'
+PO_DETAILS_COLUMNS = ['PO Number', 'PO Line Item', 'ARIBA shopping cart number : created by (Text)', 'Purchase Requisition Number', 'ARIBA Shopping cart number', 'Purchase Requisition Item']
+MS_PRIME_PR_LENGTH = 10
+ENRICHMENT_COLUMNS = ['Requester', 'PR Number', 'PR Line']
 
 def is_cache_fresh() -> bool:
     """Check if enrichment cache exists and is newer than the xlsx source."""
@@ -35,24 +49,63 @@ def save_enrichment_to_cache(enrichment: pd.DataFrame) -> None:
     """Save enrichment data to cache CSV for future runs."""
     ...
 
+def build_po_line_ids(po_numbers: pd.Series, line_items: pd.Series) -> pd.Series:
+    """
+    Build 'PO Number-PO Line Item' keys (object dtype, like the intermediates).
+
+    Integer columns are formatted and joined by Arrow kernels instead of
+    per-element Python str conversion and concatenation; other dtypes (e.g.
+    float PO Numbers when the column has blanks) keep the str() formatting.
+    """
+    ...
+
 def load_po_details(filepath: Path) -> pd.DataFrame:
     """Load PO Details Report and prepare for join."""
     ...
 
 def load_po_line_items(filepath: Path) -> pd.DataFrame:
-    """Load intermediate PO line items."""
+    """Load intermediate PO line items (multi-threaded pyarrow parser when available)."""
+    ...
+
+def _to_text(values: pd.Series, as_integer: bool=False) -> np.ndarray:
+    """
+    Format non-null values as strings in one vectorized pass (None where missing).
+
+    as_integer truncates floats to int first, so 1.2e9 -> "1200000000".
+    """
     ...
 
 def extract_enrichment_data(details: pd.DataFrame) -> pd.DataFrame:
     """Extract Requester, PR Number, and PR Line from PO Details."""
     ...
 
+def left_join_enrichment(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
+    """
+    Left join enrichment columns onto PO line items by PO Line ID.
+
+    Enrichment keys are normally unique, so each PO Line ID is looked up once
+    in the enrichment index and the columns are gathered by position (missing
+    IDs get NA), equivalent to a left merge without its bookkeeping. Adds the
+    columns to po_df in place. Duplicate keys fall back to merge so row
+    multiplication is still caught by the caller's row count check.
+    """
+    ...
+
+def is_ms_prime_pr_number(pr_numbers: pd.Series) -> np.ndarray:
+    """
+    Mask of PR Numbers that are 10 digits starting with 4 (as text).
+
+    Same rows as the regex match it replaces, including Unicode digits and
+    one trailing newline (which the regex's end anchor also accepted).
+    """
+    ...
+
 def enrich_data(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
     """Left join enrichment data to PO line items."""
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save enriched DataFrame to CSV."""
+    """Save enriched DataFrame (CSV, or Parquet if configured)."""
     ...
 
 def main():
@@ -9,19 +9,22 @@ Input: data/intermediate/po_line_items.csv, gr_postings.csv, ir_postings.csv
 Output: data/intermediate/cost_impact.csv
 
 Column Operations:
-  WRITES: Posting Date, Posting Type, Unit Price
-  READS:  Ordered Quantity, Posting Date, Purchase Value USD"""
+  WRITES: Posting Date, Posting Type
+  READS:  PO Line ID, Posting Date"""
 import sys
 from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
-from config.column_mappings import SIMPLE_VENDOR_CATEGORY, SIMPLE_ACCOUNT_CATEGORIES
+from config.column_mappings import SIMPLE_VENDOR_CATEGORY, SIMPLE_ACCOUNT_CATEGORIES, GR_POSTINGS_DTYPES, IR_POSTINGS_DTYPES
+from utils.csv_io import write_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.unit_prices import build_unit_price_lookup
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
-GR_POSTINGS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv'
-IR_POSTINGS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+GR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv')
+IR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv')
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv')
 
 def load_data():
     """Load all required data files."""
@@ -33,23 +36,26 @@ def classify_po_line_items(po_df: pd.DataFrame) -> tuple:
     
     Type 1 (Simple): Vendor Category = GLD AND Account Category IN (K, P, S, V)
     Type 2 (Complex): All others
+
+    Returns the distinct PO Line IDs of each type as Series; callers filter
+    postings with Series.isin, which hashes them in C (no Python set).
     """
     ...
 
-def calculate_simple_cost_impact(gr_df: pd.DataFrame, simple_po_ids: set) -> pd.DataFrame:
+def calculate_simple_cost_impact(gr_df: pd.DataFrame, simple_po_ids: pd.Series) -> pd.DataFrame:
     """
     Type 1: Cost impact = GR postings only (IR ignored).
     """
     ...
 
-def calculate_complex_cost_impact(gr_df: pd.DataFrame, ir_df: pd.DataFrame, complex_po_ids: set, po_df: pd.DataFrame) -> pd.DataFrame:
+def calculate_complex_cost_impact(gr_df: pd.DataFrame, ir_df: pd.DataFrame, complex_po_ids: pd.Series, po_df: pd.DataFrame) -> pd.DataFrame:
     """
     Type 2: Cost impact based on GR/IR chronological processing.
     """
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save cost impact DataFrame to CSV."""
+    """Save cost impact DataFrame (pyarrow CSV writer, or Parquet if configured)."""
     ...
 
 def main():
@@ -12,43 +12,57 @@ Input: data/intermediate/po_line_items.csv, gr_postings.csv, ir_postings.csv
 Output: data/intermediate/grir_exposures.csv
 
 Column Operations:
-  WRITES: Posting Date, Posting Type, Unit Price
-  READS:  Ordered Quantity, Posting Date, Purchase Value USD"""
+  WRITES: GRIR Value, Posting Date, Posting Type, Time Bucket
+  READS:  Days Open, PO Line ID, Posting Date"""
 import sys
 from pathlib import Path
 from datetime import date
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
 import pandas as pd
-from config.column_mappings import SIMPLE_VENDOR_CATEGORY, SIMPLE_ACCOUNT_CATEGORIES, GRIR_TIME_BUCKETS, GRIR_TIME_BUCKET_MAX
+from config.column_mappings import SIMPLE_VENDOR_CATEGORY, SIMPLE_ACCOUNT_CATEGORIES, GRIR_TIME_BUCKETS, GRIR_TIME_BUCKET_MAX, GR_POSTINGS_DTYPES, IR_POSTINGS_DTYPES
+from utils.csv_io import write_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.unit_prices import build_unit_price_lookup
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
-GR_POSTINGS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv'
-IR_POSTINGS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv'
-OUTPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'grir_exposures.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+GR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'gr_postings.csv')
+IR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'ir_postings.csv')
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'grir_exposures.csv')
 
 def load_data():
     """Load all required data files."""
     ...
 
-def get_simple_po_ids(po_df: pd.DataFrame) -> set:
+def get_simple_po_ids(po_df: pd.DataFrame) -> pd.Series:
     """
     Get PO Line IDs for Simple POs (GLD + K/P/S/V) that are NOT closed.
     These are the POs where we track GRIR exposure.
     
     Closed POs are excluded - no exposure if PO is already closed.
+    Returns the distinct IDs as a Series (for Series.isin, no Python set).
     """
     ...
+_BUCKET_THRESHOLDS = np.array(sorted(GRIR_TIME_BUCKETS))
+_BUCKET_LABELS = np.array([GRIR_TIME_BUCKETS[t] for t in sorted(GRIR_TIME_BUCKETS)] + [GRIR_TIME_BUCKET_MAX], dtype=object)
 
-def get_unit_prices(po_df: pd.DataFrame) -> dict:
-    """Calculate unit price for each PO Line ID."""
+def categorize_time_buckets(days: np.ndarray) -> np.ndarray:
+    """Categorize days into time buckets (the first threshold >= days)."""
     ...
 
-def categorize_time_bucket(days: int) -> str:
-    """Categorize days into time bucket."""
+def sort_postings(combined: pd.DataFrame) -> pd.DataFrame:
+    """
+    Order postings by (PO Line ID, Posting Date, Posting Type).
+
+    Same order as sort_values on those columns, on integer keys: the object
+    IDs are only compared once per distinct value (sorted factorize), then
+    one stable lexsort orders the rows, with missing dates last within each
+    PO and GR before IR on the same date. Expects no null PO Line IDs.
+    """
     ...
 
-def calculate_grir_exposures(gr_df: pd.DataFrame, ir_df: pd.DataFrame, simple_po_ids: set, unit_prices: dict, snapshot_date: date) -> pd.DataFrame:
+def calculate_grir_exposures(gr_df: pd.DataFrame, ir_df: pd.DataFrame, simple_po_ids: pd.Series, unit_prices: pd.Series, snapshot_date: date) -> pd.DataFrame:
     """
     Calculate GRIR exposure for each Simple PO Line ID.
     
@@ -64,7 +78,7 @@ def calculate_grir_exposures(gr_df: pd.DataFrame, ir_df: pd.DataFrame, simple_po
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save GRIR exposures DataFrame to CSV."""
+    """Save GRIR exposures DataFrame (pyarrow CSV writer, or Parquet if configured)."""
     ...
 
 def main():
@@ -27,8 +27,8 @@ Input:
 Output: data/intermediate/wbs_processed.csv
 
 Column Operations:
-  WRITES: location, sub_business_line_from_wbs, sub_business_line_mapped, sub_business_lines, wbs_number
-  READS:  ops_district, sap_wbs_raw, sub_business_line_from_wbs, sub_business_line_mapped, sub_business_line_raw, sub_business_lines_raw"""
+  WRITES: location, sub_business_line_mapped, sub_business_lines, wbs_number
+  READS:  ops_district, sub_business_line_from_wbs, sub_business_line_mapped, sub_business_line_raw, sub_business_lines_raw"""
 import sys
 import re
 import json
@@ -36,17 +36,20 @@ from pathlib import Path
 from typing import Optional, Tuple, List
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
+import numpy as np
 import pandas as pd
 from config.column_mappings import OPS_DISTRICT_TO_LOCATION, SBL_NAME_TO_CODE
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, write_intermediate
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INTERMEDIATE_DIR = PROJECT_ROOT / 'data' / 'intermediate'
 INPUT_FILES = {'projects': INTERMEDIATE_DIR / 'wbs_from_projects.csv', 'operations': INTERMEDIATE_DIR / 'wbs_from_operations.csv', 'ops_activities': INTERMEDIATE_DIR / 'wbs_from_ops_activities.csv'}
-OUTPUT_FILE = INTERMEDIATE_DIR / 'wbs_processed.csv'
+OUTPUT_FILE = intermediate_path(INTERMEDIATE_DIR / 'wbs_processed.csv')
 WBS_PATTERN = re.compile('J\\.\\d{2}\\.\\d{6}')
 BRACKET_PATTERN = re.compile('\\(([A-Z]+)\\)')
 
 def load_all_sources() -> dict:
-    """Load all WBS source files."""
+    """Load all WBS source files (multi-threaded pyarrow parser when available)."""
     ...
 
 def parse_wbs_entry(wbs_string: str) -> Tuple[Optional[str], Optional[str]]:
@@ -60,14 +63,46 @@ def parse_wbs_entry(wbs_string: str) -> Tuple[Optional[str], Optional[str]]:
     """
     ...
 
+def parse_wbs_entries(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply parse_wbs_entry to each value, returning (wbs_number, sbl_code) arrays.
+
+    WBS strings repeat across report rows, so each distinct value is parsed
+    once and the results are broadcast through factorize codes (None where
+    parsing fails or the value is missing).
+    """
+    ...
+
 def to_sbl_array(codes: List[str]) -> str:
     """Convert list of SBL codes to JSON array string for CSV storage."""
     ...
 
+def to_sbl_arrays(values: pd.Series, multi: bool=False) -> np.ndarray:
+    """
+    Convert SBL values to JSON array strings (see to_sbl_array), None where missing.
+
+    With multi=True each value is a comma-separated list of codes, otherwise a
+    single code. SBL values repeat across report rows, so each distinct value
+    is serialized once and the results are broadcast through factorize codes.
+    """
+    ...
+
+def split_wbs_raw(wbs_raw) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split a comma-separated Projects WBS value into parsed entries.
+
+    Returns (wbs_number, sub_business_lines) per entry that has a WBS number,
+    with the SBL code wrapped in array format (None when absent).
+    """
+    ...
+
 def split_and_parse_projects(df: pd.DataFrame) -> pd.DataFrame:
     """
     Split comma-separated WBS entries in Projects and parse each.
     Each WBS gets a single SBL code wrapped in array format.
+    
+    Each distinct sap_wbs_raw value is split and parsed once; rows are then
+    repeated once per entry with a single take (no per-row copies).
     """
     ...
 
@@ -102,7 +137,7 @@ def select_output_columns(df: pd.DataFrame) -> pd.DataFrame:
     ...
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the processed DataFrame to CSV."""
+    """Save the processed DataFrame (CSV, or Parquet if configured)."""
     ...
 
 def main():
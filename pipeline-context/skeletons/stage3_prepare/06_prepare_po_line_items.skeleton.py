@@ -11,22 +11,24 @@ Output: data/import-ready/po_line_items.csv
 Column Operations:
   WRITES: Total Cost Impact Amount, Total Cost Impact Qty, cost_impact_pct, cost_impact_value, fmt_po, is_approval_blocked, is_capex, is_effectively_closed, is_gts_blocked, open_po_qty
           ...and 3 more
-  READS:  Main Vendor SLB Vendor Category, PO Line ID, PO Receipt Status, Purchase Value USD, Total Cost Impact Amount, Total Cost Impact Qty, cost_impact_pct, cost_impact_value, open_po_qty, open_po_value
-          ...and 3 more"""
+  READS:  Main Vendor SLB Vendor Category, Ordered Quantity, Purchase Value USD, Total Cost Impact Amount, Total Cost Impact Qty, cost_impact_pct, cost_impact_value, open_po_qty, open_po_value, po_approval_status
+          ...and 2 more"""
 import sys
 from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
-from config.column_mappings import PO_LINE_ITEMS_MAPPING
+from config.column_mappings import COST_IMPACT_DTYPES, PO_LINE_ITEMS_MAPPING
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, read_intermediate
 try:
     from contracts.po_line_items_schema import PANDERA_AVAILABLE, POLineItemsSchema
 except ImportError:
     PANDERA_AVAILABLE = False
     POLineItemsSchema = None
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv'
-COST_IMPACT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv'
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'po_line_items.csv')
+COST_IMPACT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv')
 WBS_DETAILS_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'wbs_details.csv'
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'po_line_items.csv'
 
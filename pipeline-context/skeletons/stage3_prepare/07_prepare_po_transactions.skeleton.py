@@ -15,14 +15,15 @@ from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
-from config.column_mappings import PO_TRANSACTIONS_MAPPING
+from config.column_mappings import COST_IMPACT_DTYPES, PO_TRANSACTIONS_MAPPING
+from utils.intermediates import intermediate_path, read_intermediate
 try:
     from contracts.po_transactions_schema import PANDERA_AVAILABLE, POTransactionsSchema
 except ImportError:
     PANDERA_AVAILABLE = False
     POTransactionsSchema = None
 PROJECT_ROOT = SCRIPTS_DIR.parent
-COST_IMPACT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv'
+COST_IMPACT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'cost_impact.csv')
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'po_transactions.csv'
 
 def load_data(filepath: Path) -> pd.DataFrame:
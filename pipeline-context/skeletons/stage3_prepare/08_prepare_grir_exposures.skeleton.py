@@ -15,14 +15,15 @@ from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
-from config.column_mappings import GRIR_EXPOSURES_MAPPING, REQUIRED_COLUMNS
+from config.column_mappings import GRIR_EXPOSURES_DTYPES, GRIR_EXPOSURES_MAPPING, REQUIRED_COLUMNS
+from utils.intermediates import intermediate_path, read_intermediate
 try:
     from contracts.grir_exposures_schema import PANDERA_AVAILABLE, GRIRExposuresSchema
 except ImportError:
     PANDERA_AVAILABLE = False
     GRIRExposuresSchema = None
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'grir_exposures.csv'
+INPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'grir_exposures.csv')
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'grir_exposures.csv'
 
 def load_data(filepath: Path) -> pd.DataFrame:
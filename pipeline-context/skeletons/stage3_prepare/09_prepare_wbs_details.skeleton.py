@@ -26,8 +26,9 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
 from config.column_mappings import WBS_DETAILS_MAPPING
+from utils.intermediates import intermediate_path, read_intermediate
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'wbs_processed.csv'
+INPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'wbs_processed.csv')
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'wbs_details.csv'
 
 def load_data() -> pd.DataFrame:
@@ -24,8 +24,10 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 import pandas as pd
 from config.column_mappings import REQUIRED_COLUMNS, SAP_RESERVATIONS_MAPPING
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, read_intermediate
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / 'data' / 'intermediate' / 'reservations.csv'
+INPUT_FILE = intermediate_path(PROJECT_ROOT / 'data' / 'intermediate' / 'reservations.csv')
 OUTPUT_FILE = PROJECT_ROOT / 'data' / 'import-ready' / 'sap_reservations.csv'
 
 def load_data() -> pd.DataFrame:
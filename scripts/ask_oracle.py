@@ -17,7 +17,7 @@ Exit Codes:
   1 - System error (script crash, missing files)
 
 Usage:
-    python3 scripts/ask_oracle.py verify filter_valuation_classes
+    python3 scripts/ask_oracle.py verify filter_excluded_rows
     python3 scripts/ask_oracle.py impact 05_calculate_cost_impact
     python3 scripts/ask_oracle.py trace open_po_value --direction upstream
     python3 scripts/ask_oracle.py pattern pipeline_script
@@ -950,7 +950,7 @@ def main():  # noqa: C901
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python3 scripts/ask_oracle.py verify filter_valuation_classes
+  python3 scripts/ask_oracle.py verify filter_excluded_rows
   python3 scripts/ask_oracle.py impact 05_calculate_cost_impact
   python3 scripts/ask_oracle.py trace open_po_value --direction upstream
   python3 scripts/ask_oracle.py pattern pipeline_script
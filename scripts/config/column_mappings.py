@@ -225,6 +225,19 @@ EXCLUDED_NIS_LEVELS = [
 SIMPLE_VENDOR_CATEGORY = "GLD"
 SIMPLE_ACCOUNT_CATEGORIES = ["K", "P", "S", "V"]
 
+# Numeric dtypes pinned when reading the GR/IR postings, cost impact and GRIR
+# intermediates, so values parse identically however the writer formats them
+# (e.g. 5 vs 5.0). Kept float64: float32 carries ~7 significant digits, so
+# cents are lost on amounts above ~$167k.
+GR_POSTINGS_DTYPES = {"GR Effective Quantity": "float64", "GR Amount": "float64"}
+IR_POSTINGS_DTYPES = {"IR Effective Quantity": "float64", "Invoice Amount": "float64"}
+COST_IMPACT_DTYPES = {
+    "Posting Qty": "float64",
+    "Cost Impact Qty": "float64",
+    "Cost Impact Amount": "float64",
+}
+GRIR_EXPOSURES_DTYPES = {"GRIR Qty": "float64", "GRIR Value": "float64"}
+
 
 # =============================================================================
 # GRIR EXPOSURES: GRIR CSV → Database columns
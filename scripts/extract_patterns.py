@@ -300,8 +300,8 @@ Output: {output file paths}
     print("[3/4] Extracting data_filtering pattern...")
     
     filter_example = extract_function_example(
-        SCRIPTS_DIR / "stage1_clean" / "01_po_line_items.py",
-        "filter_valuation_classes"
+        SCRIPTS_DIR / "stage1_clean" / "02_gr_postings.py",
+        "filter_zero_quantity"
     )
     
     patterns["patterns"]["data_filtering"] = {
@@ -321,7 +321,7 @@ Output: {output file paths}
         "conventions": [
             "Always use .copy() to avoid SettingWithCopyWarning",
             "Always print the count of removed rows",
-            "Use descriptive function names: filter_zero_quantity, filter_valuation_classes",
+            "Use descriptive function names: filter_zero_quantity, filter_excluded_rows",
             "Return the filtered DataFrame (don't modify in place)",
         ],
         "template": '''def filter_{what}(df: pd.DataFrame) -> pd.DataFrame:
@@ -334,8 +334,7 @@ Output: {output file paths}
     return df_filtered''',
         "example_code": filter_example,
         "examples": [
-            "scripts/stage1_clean/01_po_line_items.py:filter_valuation_classes",
-            "scripts/stage1_clean/01_po_line_items.py:filter_nis_levels",
+            "scripts/stage1_clean/01_po_line_items.py:filter_excluded_rows",
             "scripts/stage1_clean/02_gr_postings.py:filter_zero_quantity",
         ]
     }
@@ -275,7 +275,7 @@ def generate_all(skip_pipeline_map: bool = False, incremental: bool = False, for
     
     # Step 3: Code Skeletons
     from generate_skeletons import generate_all_skeletons
-    run_generator("Code Skeletons", generate_all_skeletons)
+    run_generator("Code Skeletons", generate_all_skeletons, force=force)
     
     # Step 4: Pattern Library
     from extract_patterns import build_pattern_library
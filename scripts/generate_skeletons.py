@@ -19,15 +19,30 @@ Removes:
 
 Output: pipeline-context/skeletons/
 
+Unchanged scripts are skipped: a skeleton is reused when its source mtime,
+column annotations and the generator itself match the cache metadata
+(pipeline-context/skeletons/.cache.meta.json).
+
 Usage:
     python3 scripts/generate_skeletons.py
+    python3 scripts/generate_skeletons.py --force  # Regenerate everything
 """
 
+import argparse
 import ast
 import json
+import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Set
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+
+# Optional: orjson is ~2-3x faster for graph.json / index.json (stdlib json fallback)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Paths
 SCRIPTS_DIR = Path(__file__).parent
@@ -35,6 +50,7 @@ PROJECT_ROOT = SCRIPTS_DIR.parent
 PIPELINE_CONTEXT_DIR = PROJECT_ROOT / "pipeline-context"
 SKELETONS_DIR = PIPELINE_CONTEXT_DIR / "skeletons"
 LINEAGE_FILE = PIPELINE_CONTEXT_DIR / "lineage" / "graph.json"
+CACHE_META_FILE = SKELETONS_DIR / ".cache.meta.json"
 
 
 def load_column_access() -> Dict[str, Dict[str, List[str]]]:
@@ -46,42 +62,54 @@ def load_column_access() -> Dict[str, Dict[str, List[str]]]:
         return {}
     
     try:
-        with open(LINEAGE_FILE) as f:
-            graph = json.load(f)
-    except (json.JSONDecodeError, IOError):
+        if ORJSON_AVAILABLE:
+            graph = orjson.loads(LINEAGE_FILE.read_bytes())
+        else:
+            with open(LINEAGE_FILE) as f:
+                graph = json.load(f)
+    except (json.JSONDecodeError, IOError):  # orjson.JSONDecodeError subclasses it
         return {}
     
     column_access = graph.get("column_access", {})
     
-    # Reorganize by script
-    script_columns: Dict[str, Dict[str, Set[str]]] = {}
+    # Reorganize by script in a single pass: append now, dedupe + sort once
+    script_columns: DefaultDict[str, Dict[str, List[str]]] = defaultdict(
+        lambda: {"reads": [], "writes": []}
+    )
+    access_keys = {"READS": "reads", "WRITES": "writes"}
     
     for column, accesses in column_access.items():
         for access in accesses:
             script = access.get("script", "")
-            access_type = access.get("type", "")
-            
             if not script:
                 continue
             
-            if script not in script_columns:
-                script_columns[script] = {"reads": set(), "writes": set()}
-            
-            if access_type == "READS":
-                script_columns[script]["reads"].add(column)
-            elif access_type == "WRITES":
-                script_columns[script]["writes"].add(column)
+            # Scripts with only unknown access types still get an (empty) entry
+            cols = script_columns[script]
+            key = access_keys.get(access.get("type", ""))
+            if key is not None:
+                cols[key].append(column)
     
-    # Convert sets to sorted lists
     return {
         script: {
-            "reads": sorted(cols["reads"]),
-            "writes": sorted(cols["writes"])
+            "reads": sorted(set(cols["reads"])),
+            "writes": sorted(set(cols["writes"]))
         }
         for script, cols in script_columns.items()
     }
 
 
+def _located_expr(value: Any, location: ast.AST) -> ast.Expr:
+    """Build an `Expr(Constant(value))` statement carrying the location of `location`."""
+    constant = ast.copy_location(ast.Constant(value=value), location)
+    return ast.copy_location(ast.Expr(value=constant), location)
+
+
+def _ellipsis_stmt(node: ast.AST) -> ast.Expr:
+    """Build the `...` body statement for a skeletonized function."""
+    return _located_expr(..., node)
+
+
 class SkeletonTransformer(ast.NodeTransformer):
     """Transform AST to skeleton form by removing function bodies."""
     
@@ -97,7 +125,7 @@ class SkeletonTransformer(ast.NodeTransformer):
             new_body.append(node.body[0])
         
         # Add ellipsis as body
-        new_body.append(ast.Expr(value=ast.Constant(value=...)))
+        new_body.append(_ellipsis_stmt(node))
         
         node.body = new_body
         return node
@@ -112,7 +140,7 @@ class SkeletonTransformer(ast.NodeTransformer):
             isinstance(node.body[0].value.value, str)):
             new_body.append(node.body[0])
         
-        new_body.append(ast.Expr(value=ast.Constant(value=...)))
+        new_body.append(_ellipsis_stmt(node))
         
         node.body = new_body
         return node
@@ -123,13 +151,22 @@ class SkeletonTransformer(ast.NodeTransformer):
         return node
 
 
+# Stateless, so one instance is shared across all files
+_SKELETON_TRANSFORMER = SkeletonTransformer()
+
+
 def generate_skeleton(source_code: str, script_name: str = "", column_info: Optional[Dict] = None) -> str:
     """
     Generate skeleton from source code.
     
     If column_info is provided, adds column annotations to the module docstring.
     """
-    tree = ast.parse(source_code)
+    # Equivalent to ast.parse without its wrapper; the filename improves SyntaxErrors.
+    # PyCF_TYPE_COMMENTS is deliberately not set: unparse would emit them.
+    tree: ast.Module = compile(
+        source_code, script_name or "<skeleton>", "exec",
+        flags=ast.PyCF_ONLY_AST, dont_inherit=True,
+    )
     
     # Add column annotations to module docstring if available
     if column_info:
@@ -140,11 +177,9 @@ def generate_skeleton(source_code: str, script_name: str = "", column_info: Opti
             annotation = _build_column_annotation(reads, writes)
             tree = _add_column_annotation_to_docstring(tree, annotation)
     
-    transformer = SkeletonTransformer()
-    skeleton_tree = transformer.visit(tree)
-    
-    # Fix missing lineno/col_offset for new nodes
-    ast.fix_missing_locations(skeleton_tree)
+    # New nodes get their locations at creation (copy_location), so no
+    # whole-tree fix_missing_locations walk is needed
+    skeleton_tree = _SKELETON_TRANSFORMER.visit(tree)
     
     return ast.unparse(skeleton_tree)
 
@@ -178,7 +213,7 @@ def _add_column_annotation_to_docstring(tree: ast.Module, annotation: str) -> as
         first.value.value = first.value.value.rstrip() + annotation
     else:
         # No docstring - create one with just the annotation
-        docstring = ast.Expr(value=ast.Constant(value=f'"""{annotation.strip()}"""'))
+        docstring = _located_expr(f'"""{annotation.strip()}"""', first)
         tree.body.insert(0, docstring)
     
     return tree
@@ -222,8 +257,96 @@ def generate_skeleton_file(source_path: Path, output_path: Path, column_info: Op
         }
 
 
-def generate_all_skeletons() -> Dict[str, Any]:
-    """Generate skeletons for all pipeline scripts with column annotations."""
+def write_json(path: Path, data: Any) -> None:
+    """Write JSON with 2-space indent and sorted keys (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_cache_meta() -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-script cache metadata from the previous run.
+    Returns {} if missing, corrupted, or written by a different generator version.
+    """
+    if not CACHE_META_FILE.exists():
+        return {}
+    
+    try:
+        with open(CACHE_META_FILE) as f:
+            meta = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    
+    # Code change = invalidate everything
+    if meta.get("generator_mtime") != Path(__file__).stat().st_mtime:
+        return {}
+    return meta.get("scripts", {})
+
+
+def save_cache_meta(scripts_meta: Dict[str, Dict[str, Any]]) -> None:
+    """Save per-script cache metadata (temp file + rename)."""
+    meta = {
+        "generator_mtime": Path(__file__).stat().st_mtime,
+        "scripts": scripts_meta,
+    }
+    temp_file = CACHE_META_FILE.with_suffix(".tmp")
+    write_json(temp_file, meta)
+    temp_file.rename(CACHE_META_FILE)
+
+
+def is_skeleton_fresh(
+    cached: Optional[Dict[str, Any]],
+    source_path: Path,
+    output_path: Path,
+    column_info: Optional[Dict],
+) -> bool:
+    """Check that a skeleton exists and was built from this source and column info."""
+    if not cached or not output_path.exists():
+        return False
+    if cached.get("source_mtime") != source_path.stat().st_mtime:
+        return False
+    return cached.get("column_info") == (column_info or {})
+
+
+def _process_one(
+    script_path: Path,
+    output_path: Path,
+    column_info: Optional[Dict],
+    cached: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Generate (or reuse) one skeleton.
+    Returns (stats, log_lines); log lines are buffered so the caller emits
+    each script's output in a single write.
+    """
+    log_lines = [f"  Processing: {script_path.name}"]
+    
+    if cached is not None and is_skeleton_fresh(cached, script_path, output_path, column_info):
+        stats = cached["stats"]
+        log_lines.append("    Unchanged (cached)")
+    else:
+        stats = generate_skeleton_file(script_path, output_path, column_info)
+    
+    if stats["success"]:
+        log_lines.append(
+            f"    {stats['original_lines']} -> {stats['skeleton_lines']} lines ({stats['compression_ratio']}x)"
+        )
+    else:
+        log_lines.append(f"    Error: {stats['error']}")
+    
+    return stats, log_lines
+
+
+def generate_all_skeletons(force: bool = False) -> Dict[str, Any]:
+    """
+    Generate skeletons for all pipeline scripts with column annotations.
+    
+    Args:
+        force: Regenerate every skeleton, ignoring the cache metadata
+    """
     print("=" * 60)
     print("Generating Code Skeletons")
     print("=" * 60)
@@ -236,6 +359,9 @@ def generate_all_skeletons() -> Dict[str, Any]:
     if script_columns:
         print(f"  Loaded column access data for {len(script_columns)} scripts")
     
+    cache_meta = {} if force else load_cache_meta()
+    new_cache_meta: Dict[str, Dict[str, Any]] = {}
+    
     # Collect scripts to process
     stage_dirs = ["stage1_clean", "stage2_transform", "stage3_prepare"]
     results = {
@@ -263,13 +389,21 @@ def generate_all_skeletons() -> Dict[str, Any]:
             output_path = output_dir / skeleton_name
             script_name = script_path.stem
             
-            print(f"  Processing: {script_path.name}")
-            
             # Get column info for this script
             column_info = script_columns.get(script_name)
-            stats = generate_skeleton_file(script_path, output_path, column_info)
+            cache_key = f"{stage_dir}/{script_path.name}"
+            stats, log_lines = _process_one(
+                script_path, output_path, column_info, cache_meta.get(cache_key)
+            )
+            # One write per script keeps each script's log block contiguous
+            sys.stdout.write("\n".join(log_lines) + "\n")
             
             if stats["success"]:
+                new_cache_meta[cache_key] = {
+                    "source_mtime": script_path.stat().st_mtime,
+                    "column_info": column_info or {},
+                    "stats": stats,
+                }
                 script_info = {
                     "name": script_path.stem,
                     "source_path": str(script_path.relative_to(PROJECT_ROOT)),
@@ -287,10 +421,6 @@ def generate_all_skeletons() -> Dict[str, Any]:
                 results["totals"]["skeleton_lines"] += stats["skeleton_lines"]
                 results["totals"]["original_tokens"] += stats["original_tokens"]
                 results["totals"]["skeleton_tokens"] += stats["skeleton_tokens"]
-                
-                print(f"    {stats['original_lines']} -> {stats['skeleton_lines']} lines ({stats['compression_ratio']}x)")
-            else:
-                print(f"    Error: {stats['error']}")
     
     # Also generate skeleton for config files
     config_dir = SCRIPTS_DIR / "config"
@@ -305,6 +435,11 @@ def generate_all_skeletons() -> Dict[str, Any]:
             
             print(f"  Processing: {script_path.name}")
             
+            if (not force and output_path.exists()
+                    and output_path.stat().st_mtime >= script_path.stat().st_mtime):
+                print("    Unchanged (cached)")
+                continue
+            
             # For config files, we keep everything (no function bodies to remove)
             # Just copy with minimal processing
             content = script_path.read_text()
@@ -322,8 +457,9 @@ def generate_all_skeletons() -> Dict[str, Any]:
     
     # Save index
     index_path = SKELETONS_DIR / "index.json"
-    with open(index_path, "w") as f:
-        json.dump(results, f, indent=2, sort_keys=True)
+    write_json(index_path, results)
+    
+    save_cache_meta(new_cache_meta)
     
     print("\n" + "=" * 60)
     print("Skeleton Generation Complete!")
@@ -338,4 +474,11 @@ def generate_all_skeletons() -> Dict[str, Any]:
 
 
 if __name__ == "__main__":
-    generate_all_skeletons()
+    parser = argparse.ArgumentParser(description="Generate code skeletons")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate all skeletons even if sources are unchanged"
+    )
+    args = parser.parse_args()
+    generate_all_skeletons(force=args.force)
@@ -10,6 +10,17 @@ Usage:
     python3 scripts/pipeline.py --stage1  # Run only stage 1
     python3 scripts/pipeline.py --stage2  # Run stages 1-2
     python3 scripts/pipeline.py --stage3  # Run all stages (same as full)
+    python3 scripts/pipeline.py --isolated  # Run each script in its own interpreter
+    python3 scripts/pipeline.py --format parquet  # Parquet intermediates
+    python3 scripts/pipeline.py --jobs 4  # Run independent scripts concurrently
+
+Scripts run in-process by default (one interpreter, pandas imported once,
+and intermediates read by several scripts are parsed once). Use --isolated to run each script as a subprocess, e.g. when debugging
+state leaking between scripts.
+
+With --jobs N, scripts within a stage run as up to N concurrent subprocesses,
+ordered by SCRIPT_DEPENDENCIES; stages still run one after another. Each
+script's output is printed as one block when it finishes.
 
 Pipeline Stages:
     Stage 1 (Clean):     Raw data → Intermediate (cleaned)
@@ -25,14 +36,27 @@ Output:
 """
 
 import argparse
+import importlib.util
+import os
 import subprocess
 import sys
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
 
 # Paths
 SCRIPTS_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from utils.intermediates import (  # noqa: E402
+    INTERMEDIATE_FORMAT_ENV,
+    SUPPORTED_FORMATS,
+    enable_read_cache,
+    evict_cached_reads,
+)
 
 # Pipeline definition: (script_path, description)
 STAGE1_SCRIPTS = [
@@ -71,14 +95,48 @@ STAGE3_SCRIPTS = [
     ),
 ]
 
-
-def run_script(script_path: Path, description: str) -> bool:
-    """Run a Python script and return success status."""
+# Same-stage ordering constraints for --jobs (earlier stages always finish first).
+# script -> scripts in its stage that must complete before it starts
+SCRIPT_DEPENDENCIES = {
+    # GR/IR cleaning reads the PO line items (unit price sidecar) from 01
+    "stage1_clean/02_gr_postings.py": ["stage1_clean/01_po_line_items.py"],
+    "stage1_clean/03_ir_postings.py": ["stage1_clean/01_po_line_items.py"],
+    # Cost impact and GRIR read the PO line items rewritten by enrichment
+    "stage2_transform/05_calculate_cost_impact.py": ["stage2_transform/04_enrich_po_line_items.py"],
+    "stage2_transform/06_calculate_grir.py": [
+        "stage2_transform/04_enrich_po_line_items.py",
+        "stage2_transform/05_calculate_cost_impact.py",
+    ],
+    # 06 reads wbs_details.csv, which 09 rewrites; keep the sequential order
+    "stage3_prepare/09_prepare_wbs_details.py": ["stage3_prepare/06_prepare_po_line_items.py"],
+}
+
+# Intermediates read by more than one script (file stem -> last script that
+# reads it). In-process runs keep only these in the read cache, and drop each
+# once its last reader has finished.
+SHARED_INTERMEDIATES = {
+    # Unit price sidecar: GR and IR cleaning
+    "po_line_items.unit_price": "stage1_clean/03_ir_postings.py",
+    # Enriched PO line items: cost impact, GRIR and the stage3 PO prepare script
+    "po_line_items": "stage3_prepare/06_prepare_po_line_items.py",
+    "gr_postings": "stage2_transform/06_calculate_grir.py",
+    "ir_postings": "stage2_transform/06_calculate_grir.py",
+    "cost_impact": "stage3_prepare/07_prepare_po_transactions.py",
+}
+
+
+def print_script_header(script_path: Path, description: str) -> None:
+    """Print the banner shown before each script runs."""
     print(f"\n{'='*60}")
     print(f"Running: {description}")
     print(f"Script:  {script_path}")
     print("=" * 60)
 
+
+def run_script(script_path: Path, description: str) -> bool:
+    """Run a Python script in a subprocess and return success status."""
+    print_script_header(script_path, description)
+
     try:
         subprocess.run([sys.executable, str(script_path)], cwd=PROJECT_ROOT, check=True)
         return True
@@ -87,8 +145,67 @@ def run_script(script_path: Path, description: str) -> bool:
         return False
 
 
-def run_stage(stage_name: str, scripts: list) -> bool:
-    """Run all scripts in a stage."""
+def run_script_captured(script_path: Path) -> tuple[bool, str]:
+    """Run a Python script in a subprocess, returning (success, combined output)."""
+    result = subprocess.run(
+        [sys.executable, str(script_path)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    output = result.stdout
+    if result.returncode != 0:
+        output += f"\nERROR: Script failed with exit code {result.returncode}\n"
+    return result.returncode == 0, output
+
+
+def load_script_module(script_path: Path) -> ModuleType:
+    """
+    Load a pipeline script as a module.
+
+    Script file names start with digits (e.g. 01_po_line_items.py), so they
+    are loaded by path rather than with importlib.import_module. The stage
+    directory is part of the module name because stage2 and stage3 both
+    have a 06_ and 07_ script.
+    """
+    module_name = f"pipeline_{script_path.parent.name}_{script_path.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load script: {script_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_script_in_process(script_path: Path, description: str) -> bool:
+    """
+    Run a pipeline script's main() in this interpreter and return success status.
+
+    Mirrors run_script: main() returning False, sys.exit with a non-zero
+    code, or an uncaught exception all count as failure.
+    """
+    print_script_header(script_path, description)
+
+    try:
+        module = load_script_module(script_path)
+        success = module.main()
+    except SystemExit as e:
+        success = e.code in (0, None)
+    except Exception:
+        traceback.print_exc()
+        print("\nERROR: Script raised an exception")
+        return False
+
+    if not success:
+        print("\nERROR: Script reported failure")
+        return False
+    return True
+
+
+def run_stage(stage_name: str, scripts: list, isolated: bool = False) -> bool:
+    """Run all scripts in a stage (in-process unless isolated)."""
     print(f"\n{'#'*60}")
     print(f"# {stage_name}")
     print(f"{'#'*60}")
@@ -99,13 +216,73 @@ def run_stage(stage_name: str, scripts: list) -> bool:
             print(f"ERROR: Script not found: {script_path}")
             return False
 
-        if not run_script(script_path, description):
+        runner = run_script if isolated else run_script_in_process
+        if not runner(script_path, description):
             return False
+        evict_cached_reads(
+            name for name, last_reader in SHARED_INTERMEDIATES.items()
+            if last_reader == script_rel_path
+        )
 
     return True
 
 
-def run_pipeline(max_stage: int = 3) -> bool:
+def run_stage_parallel(stage_name: str, scripts: list, jobs: int) -> bool:
+    """
+    Run a stage's scripts as concurrent subprocesses (at most `jobs` at once).
+
+    A script starts once its SCRIPT_DEPENDENCIES within the stage have
+    succeeded; otherwise scripts start in list order. After a failure no new
+    scripts are started, but running ones are allowed to finish.
+    """
+    print(f"\n{'#'*60}")
+    print(f"# {stage_name} (up to {jobs} scripts in parallel)")
+    print(f"{'#'*60}")
+
+    for script_rel_path, _ in scripts:
+        if not (SCRIPTS_DIR / script_rel_path).exists():
+            print(f"ERROR: Script not found: {SCRIPTS_DIR / script_rel_path}")
+            return False
+
+    stage_scripts = {script_rel_path for script_rel_path, _ in scripts}
+    pending = list(scripts)
+    running: dict[Future, tuple[str, str]] = {}
+    completed: set[str] = set()
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while running or (pending and not failed):
+            if not failed:
+                for script_rel_path, description in list(pending):
+                    if len(running) >= jobs:
+                        break
+                    deps = SCRIPT_DEPENDENCIES.get(script_rel_path, [])
+                    if all(dep in completed or dep not in stage_scripts for dep in deps):
+                        pending.remove((script_rel_path, description))
+                        future = pool.submit(run_script_captured, SCRIPTS_DIR / script_rel_path)
+                        running[future] = (script_rel_path, description)
+
+            if not running:
+                # Remaining scripts wait on a dependency that can never complete
+                print(f"ERROR: Unsatisfiable dependencies: {[path for path, _ in pending]}")
+                return False
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                script_rel_path, description = running.pop(future)
+                success, output = future.result()
+                print_script_header(SCRIPTS_DIR / script_rel_path, description)
+                sys.stdout.write(output)
+                sys.stdout.flush()
+                if success:
+                    completed.add(script_rel_path)
+                else:
+                    failed = True
+
+    return not failed
+
+
+def run_pipeline(max_stage: int = 3, isolated: bool = False, jobs: int = 1) -> bool:
     """Run the pipeline up to the specified stage."""
     start_time = datetime.now()
 
@@ -114,6 +291,11 @@ def run_pipeline(max_stage: int = 3) -> bool:
     print(" Started at:", start_time.strftime("%Y-%m-%d %H:%M:%S"))
     print("=" * 60)
 
+    # In-process runs share one interpreter, so later scripts can reuse
+    # intermediates already parsed by earlier ones
+    if not isolated and jobs == 1:
+        enable_read_cache(SHARED_INTERMEDIATES)
+
     stages = [
         ("STAGE 1: CLEAN", STAGE1_SCRIPTS),
         ("STAGE 2: TRANSFORM", STAGE2_SCRIPTS),
@@ -124,7 +306,11 @@ def run_pipeline(max_stage: int = 3) -> bool:
         if i > max_stage:
             break
 
-        if not run_stage(stage_name, scripts):
+        if jobs > 1:
+            stage_ok = run_stage_parallel(stage_name, scripts, jobs)
+        else:
+            stage_ok = run_stage(stage_name, scripts, isolated)
+        if not stage_ok:
             print(f"\n{'!'*60}")
             print(f"! PIPELINE FAILED at {stage_name}")
             print(f"{'!'*60}")
@@ -159,6 +345,9 @@ Examples:
     python3 scripts/pipeline.py           # Run full pipeline
     python3 scripts/pipeline.py --stage1  # Run only stage 1 (clean)
     python3 scripts/pipeline.py --stage2  # Run stages 1-2 (clean + transform)
+    python3 scripts/pipeline.py --isolated  # One subprocess per script
+    python3 scripts/pipeline.py --format parquet  # Parquet intermediates
+    python3 scripts/pipeline.py --jobs 4  # Independent scripts in parallel
         """,
     )
 
@@ -171,6 +360,24 @@ Examples:
     parser.add_argument(
         "--stage3", action="store_true", help="Run all stages (default)"
     )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Run each script in its own subprocess (slower, for debugging)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N independent scripts per stage concurrently, as subprocesses (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=SUPPORTED_FORMATS,
+        default=None,
+        help=f"Intermediate file format (default: csv, or ${INTERMEDIATE_FORMAT_ENV})",
+    )
 
     args = parser.parse_args()
 
@@ -181,7 +388,14 @@ Examples:
     else:
         max_stage = 3
 
-    success = run_pipeline(max_stage)
+    # Scripts read the format from the environment (inherited by --isolated subprocesses)
+    if args.format:
+        os.environ[INTERMEDIATE_FORMAT_ENV] = args.format
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    success = run_pipeline(max_stage, isolated=args.isolated, jobs=args.jobs)
     sys.exit(0 if success else 1)
 
 
@@ -2,33 +2,114 @@
 """
 Data Profiling Tool for Agent-Assisted Development
 
-Profiles a column from a CSV file to help agents understand data before coding.
+Profiles a column from a CSV or Parquet file to help agents understand data before coding.
 This prevents blind assumptions about data values, distributions, and edge cases.
 
 Usage:
     python3 scripts/profile_data.py <file_path> <column_name>
     python3 scripts/profile_data.py data/intermediate/po_line_items.csv "PO Receipt Status"
+    python3 scripts/profile_data.py data/intermediate/po_line_items.parquet  # pipeline.py --format parquet
+    python3 scripts/profile_data.py <file_path> [column_name] --exact  # Exact unique counts
 
 Output: JSON with dtype, nulls, unique values, and distribution.
+
+Unique counts of numeric columns are HyperLogLog estimates (about 1% error,
+usually exact for small counts) unless --exact is given; "unique_count_exact"
+in the output says which was used.
 """
 
+import numpy as np
 import pandas as pd
 import sys
 import json
 from pathlib import Path
+from typing import Optional
+
+# HyperLogLog registers = 2**HLL_PRECISION (standard error ~1.04 / sqrt(registers))
+HLL_PRECISION = 14
+
+
+def approximate_unique_count(values: np.ndarray) -> int:
+    """
+    Estimate the number of distinct values with HyperLogLog.
+
+    Values are hashed once (pd.util.hash_array); no hash table of the
+    distinct values is built. Uses linear counting for small cardinalities.
+    """
+    if len(values) == 0:
+        return 0
+    p = HLL_PRECISION
+    m = 1 << p
+    hashes = pd.util.hash_array(values)
+    register_index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+    
+    # rank = leading zeros of the remaining 64-p bits + 1 (sentinel bit caps it)
+    bits = (hashes << np.uint64(p)) | np.uint64(1 << (p - 1))
+    rank = np.ones(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        top_zero = (bits >> np.uint64(64 - shift)) == 0
+        rank[top_zero] += shift
+        bits[top_zero] <<= np.uint64(shift)
+    
+    registers = np.zeros(m, dtype=np.uint8)
+    np.maximum.at(registers, register_index, rank)
+    
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    empty_registers = int((registers == 0).sum())
+    if estimate <= 2.5 * m and empty_registers:
+        estimate = m * np.log(m / empty_registers)
+    return int(round(estimate))
 
 
-def profile_column(file_path: str, column_name: str) -> dict:
-    """Profile a single column from a CSV file."""
-    df = pd.read_csv(file_path, low_memory=False)
+def null_and_unique_counts(col: pd.Series, exact: bool = False) -> tuple[int, int, bool]:
+    """
+    Return (null_count, unique_count, unique_count_is_exact) for a column.
+
+    Exact: one factorize() pass, where code -1 marks nulls and the uniques are
+    the distinct non-null values (matches isna().sum() and nunique()).
+    Numeric columns otherwise get a HyperLogLog estimate. Text columns are
+    always counted exactly: hashing Python strings for HLL costs more than
+    factorize(), which reuses their cached hashes.
+    """
+    if exact or not pd.api.types.is_numeric_dtype(col):
+        codes, uniques = pd.factorize(col)
+        return int((codes == -1).sum()), len(uniques), True
     
-    if column_name not in df.columns:
+    values = col.to_numpy()
+    missing = pd.isna(values)
+    return int(missing.sum()), approximate_unique_count(values[~missing]), False
+
+
+def read_column_names(file_path: str) -> list[str]:
+    """Return a file's column names without loading its rows."""
+    if Path(file_path).suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(file_path).names
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+
+def load_data(file_path: str, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """Load a CSV or Parquet file (dispatching on suffix), optionally only some columns."""
+    if Path(file_path).suffix == ".parquet":
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_csv(file_path, usecols=columns, low_memory=False)
+
+
+def profile_column(file_path: str, column_name: str, exact: bool = False) -> dict:
+    """Profile a single column from a CSV or Parquet file."""
+    available_columns = read_column_names(file_path)
+    if column_name not in available_columns:
         return {
             "error": f"Column '{column_name}' not found",
-            "available_columns": sorted(df.columns.tolist())
+            "available_columns": sorted(available_columns)
         }
     
+    # Only the profiled column is parsed
+    df = load_data(file_path, columns=[column_name])
+    
     col = df[column_name]
+    null_count, unique_count, unique_count_exact = null_and_unique_counts(col, exact)
     
     # Basic stats
     stats = {
@@ -36,14 +117,15 @@ def profile_column(file_path: str, column_name: str) -> dict:
         "column": column_name,
         "dtype": str(col.dtype),
         "total_rows": len(df),
-        "null_count": int(col.isna().sum()),
-        "null_pct": round(col.isna().mean() * 100, 2),
-        "non_null_count": int(col.notna().sum()),
-        "unique_count": int(col.nunique()),
+        "null_count": null_count,
+        "null_pct": round(null_count / len(df) * 100, 2) if len(df) else float("nan"),
+        "non_null_count": len(df) - null_count,
+        "unique_count": unique_count,
+        "unique_count_exact": unique_count_exact,
     }
     
     # For categorical/object columns: show value distribution
-    if col.dtype == 'object' or col.nunique() <= 20:
+    if col.dtype == 'object' or unique_count <= 20:
         value_counts = col.value_counts(dropna=False)
         stats["value_distribution"] = {
             str(k) if pd.notna(k) else "<NULL>": int(v) 
@@ -55,52 +137,60 @@ def profile_column(file_path: str, column_name: str) -> dict:
     
     # For numeric columns: show summary stats
     if pd.api.types.is_numeric_dtype(col):
-        stats["min"] = float(col.min()) if col.notna().any() else None
-        stats["max"] = float(col.max()) if col.notna().any() else None
-        stats["mean"] = round(float(col.mean()), 4) if col.notna().any() else None
-        stats["median"] = float(col.median()) if col.notna().any() else None
+        has_values = null_count < len(col)
+        stats["min"] = float(col.min()) if has_values else None
+        stats["max"] = float(col.max()) if has_values else None
+        stats["mean"] = round(float(col.mean()), 4) if has_values else None
+        stats["median"] = float(col.median()) if has_values else None
     
     return stats
 
 
-def profile_file(file_path: str) -> dict:
-    """Profile all columns from a CSV file (summary only)."""
-    df = pd.read_csv(file_path, low_memory=False)
+def profile_file(file_path: str, exact: bool = False) -> dict:
+    """Profile all columns from a CSV or Parquet file (summary only)."""
+    df = load_data(file_path)
+    
+    columns = []
+    for col in df.columns:
+        null_count, unique_count, unique_count_exact = null_and_unique_counts(df[col], exact)
+        columns.append({
+            "name": col,
+            "dtype": str(df[col].dtype),
+            "null_pct": round(null_count / len(df) * 100, 2) if len(df) else float("nan"),
+            "unique_count": unique_count,
+            "unique_count_exact": unique_count_exact,
+        })
     
     return {
         "file": str(file_path),
         "total_rows": len(df),
         "total_columns": len(df.columns),
-        "columns": [
-            {
-                "name": col,
-                "dtype": str(df[col].dtype),
-                "null_pct": round(df[col].isna().mean() * 100, 2),
-                "unique_count": int(df[col].nunique())
-            }
-            for col in df.columns
-        ]
+        "columns": columns,
     }
 
 
 def main():
-    if len(sys.argv) < 2:
+    exact = "--exact" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--exact"]
+    
+    if len(args) < 1:
         print("Usage:")
         print("  python3 scripts/profile_data.py <file_path> <column_name>  # Profile specific column")
         print("  python3 scripts/profile_data.py <file_path>                # Profile all columns (summary)")
+        print("  Add --exact for exact unique counts (default: HyperLogLog estimate)")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
     
     if not Path(file_path).exists():
         print(json.dumps({"error": f"File not found: {file_path}"}, indent=2))
         sys.exit(1)
     
-    if len(sys.argv) >= 3:
-        column_name = sys.argv[2]
-        result = profile_column(file_path, column_name)
+    if len(args) >= 2:
+        column_name = args[1]
+        result = profile_column(file_path, column_name, exact)
     else:
-        result = profile_file(file_path)
+        result = profile_file(file_path, exact)
     
     print(json.dumps(result, indent=2))
 
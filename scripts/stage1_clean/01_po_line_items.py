@@ -17,6 +17,7 @@ from pathlib import Path
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+import numpy as np
 import pandas as pd
 from config.column_mappings import (
     EXCLUDED_VALUATION_CLASSES,
@@ -24,83 +25,190 @@ from config.column_mappings import (
     VENDOR_NAME_MAPPING,
     PLANT_CODE_TO_LOCATION,
 )
+from utils.csv_io import PYARROW_AVAILABLE, read_csv, read_csv_table, table_to_pandas
+from utils.frames import take_rows
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.unit_prices import write_unit_price_sidecar
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_FILE = PROJECT_ROOT / "data" / "raw" / "po line items.csv"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
+
+# Helper column: PO Valuation Class parsed once, shared by the filter/fill steps
+VALUATION_CLASS_NUM = "_PO Valuation Class num"
+
+# Exclusion lists as arrays, converted once at import for np.isin
+_EXCLUDED_VALUATION_CLASSES = np.array(EXCLUDED_VALUATION_CLASSES, dtype="float64")
+_EXCLUDED_NIS_LEVELS = np.array(EXCLUDED_NIS_LEVELS, dtype=object)
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw CSV file."""
+    """Load the raw CSV file (multi-threaded pyarrow parser when available)."""
     print(f"Loading data from: {filepath}")
-    df = pd.read_csv(filepath)
+    df = read_csv(filepath)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
     return df
 
 
-def filter_valuation_classes(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove rows with excluded PO Valuation Classes."""
-    initial_count = len(df)
-    valuation_class = pd.to_numeric(df["PO Valuation Class"], errors="coerce")
-    mask = ~valuation_class.isin(EXCLUDED_VALUATION_CLASSES)
-    df_filtered = df[mask].copy()
-    removed_count = initial_count - len(df_filtered)
-    print(f"  Removed {removed_count:,} rows with Valuation Classes {EXCLUDED_VALUATION_CLASSES}")
-    return df_filtered
-
-
-def filter_nis_levels(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove rows with excluded NIS Level 0 Desc values."""
-    initial_count = len(df)
-    mask = ~df["NIS Level 0 Desc"].isin(EXCLUDED_NIS_LEVELS)
-    df_filtered = df[mask].copy()
-    removed_count = initial_count - len(df_filtered)
-    print(f"  Removed {removed_count:,} rows with excluded NIS Levels")
-    return df_filtered
-
-
-def fill_nis_level_for_3021(df: pd.DataFrame) -> pd.DataFrame:
-    """Set NIS Level 0 Desc to 'Materials and Supplies' for Valuation Class 3021 where null."""
-    valuation_class = pd.to_numeric(df["PO Valuation Class"], errors="coerce")
-    mask = (valuation_class == 3021) & (df["NIS Level 0 Desc"].isna() | (df["NIS Level 0 Desc"] == ""))
-    updated_count = mask.sum()
-    df.loc[mask, "NIS Level 0 Desc"] = "Materials and Supplies"
-    print(f"  Set NIS Level for {updated_count:,} rows (Valuation Class 3021)")
+def load_filtered_data(filepath: Path) -> pd.DataFrame:
+    """
+    Load the raw CSV without the excluded valuation class / NIS level rows.
+
+    Same result as load_data + add_numeric_valuation_class +
+    filter_excluded_rows (column types are inferred from the whole file), but
+    with pyarrow the rows are dropped from the Arrow table before conversion,
+    so excluded rows never become Python objects and peak memory tracks the
+    kept rows.
+    """
+    if not PYARROW_AVAILABLE:
+        df = add_numeric_valuation_class(load_data(filepath))
+        return filter_excluded_rows(df)
+
+    print(f"Loading data from: {filepath}")
+    table = read_csv_table(filepath)
+    print(f"  Loaded {table.num_rows:,} rows, {table.num_columns} columns")
+
+    # Only the two filter columns are converted to evaluate the masks
+    keys = add_numeric_valuation_class(
+        table_to_pandas(table.select(["PO Valuation Class", "NIS Level 0 Desc"]))
+    )
+    keep = get_excluded_rows_keep_mask(keys)
+    # Rebind so the unfiltered table is freed before conversion allocates the frame
+    table = table.filter(keep)
+    df = table_to_pandas(table)
+    df[VALUATION_CLASS_NUM] = keys[VALUATION_CLASS_NUM].to_numpy()[keep]
+    return df
+
+
+def add_numeric_valuation_class(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse PO Valuation Class to numeric once (dropped again before save)."""
+    df[VALUATION_CLASS_NUM] = pd.to_numeric(df["PO Valuation Class"], errors="coerce")
     return df
 
 
+def _not_in(values: np.ndarray, excluded: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of values not in an exclusion array.
+
+    np.isin runs in C on the raw array. It compares elementwise for short
+    lists like the current ones and switches to a sort-based search if the
+    config grows. pandas' isin builds a hash table per call and is ~100x
+    slower here. NaN matches nothing, so it is kept (same as isin).
+    """
+    return ~np.isin(values, excluded)
+
+
+def _per_distinct(values: pd.Series, func, na_value) -> np.ndarray:
+    """
+    Evaluate func once per distinct value and broadcast back to every row.
+
+    Low-cardinality text columns (NIS levels, vendor IDs) are factorized to
+    integer codes, so func only sees the handful of unique values; missing
+    values get na_value.
+    """
+    codes, uniques = pd.factorize(values)
+    return np.append(func(np.asarray(uniques)), na_value)[codes]
+
+
+def get_valuation_class_mask(df: pd.DataFrame) -> np.ndarray:
+    """Keep-mask: True where PO Valuation Class is not excluded."""
+    return _not_in(df[VALUATION_CLASS_NUM].to_numpy(), _EXCLUDED_VALUATION_CLASSES)
+
+
+def get_nis_level_mask(df: pd.DataFrame) -> np.ndarray:
+    """Keep-mask: True where NIS Level 0 Desc is not excluded."""
+    return _per_distinct(
+        df["NIS Level 0 Desc"],
+        lambda levels: _not_in(levels, _EXCLUDED_NIS_LEVELS),
+        na_value=True,
+    )
+
+
+def get_excluded_rows_keep_mask(df: pd.DataFrame) -> np.ndarray:
+    """Combined valuation class and NIS level keep-mask (prints removal counts)."""
+    valuation_keep = get_valuation_class_mask(df)
+    nis_keep = get_nis_level_mask(df)
+    print(f"  Removed {(~valuation_keep).sum():,} rows with Valuation Classes {EXCLUDED_VALUATION_CLASSES}")
+    print(f"  Removed {(valuation_keep & ~nis_keep).sum():,} rows with excluded NIS Levels")
+    return valuation_keep & nis_keep
+
+
+def filter_excluded_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove rows with excluded PO Valuation Classes or NIS Level 0 Desc values.
+
+    The two keep-masks are ANDed first, so the frame is copied once.
+    """
+    return take_rows(df, get_excluded_rows_keep_mask(df))
+
+
 def transform_nis_column(df: pd.DataFrame) -> pd.DataFrame:
-    """Rename NIS Level 0 Desc to NIS Line and clean up values."""
-    # Replace "Lease and Rent Total" with "Lease and Rent"
-    mask = df["NIS Level 0 Desc"] == "Lease and Rent Total"
-    df.loc[mask, "NIS Level 0 Desc"] = "Lease and Rent"
-    print(f"  Normalized 'Lease and Rent Total' → 'Lease and Rent': {mask.sum():,} rows")
+    """
+    Fill, normalize and rename NIS Level 0 Desc to NIS Line.
+
+    - Valuation Class 3021 rows with no NIS level get 'Materials and Supplies'
+    - 'Lease and Rent Total' becomes 'Lease and Rent'
+
+    Both fixes are computed from one copy of the column (reusing the parsed
+    valuation class) and written back with a single column assignment.
+    """
+    nis = df["NIS Level 0 Desc"].to_numpy(dtype=object, copy=True)
     
-    # Rename column
-    df = df.rename(columns={"NIS Level 0 Desc": "NIS Line"})
+    # Set 'Materials and Supplies' for Valuation Class 3021 where null/empty
+    fill_mask = (df[VALUATION_CLASS_NUM].to_numpy() == 3021) & (pd.isna(nis) | (nis == ""))
+    # Replace "Lease and Rent Total" with "Lease and Rent" (checked per distinct level)
+    lease_mask = _per_distinct(
+        df["NIS Level 0 Desc"],
+        lambda levels: levels == "Lease and Rent Total",
+        na_value=False,
+    )
+    nis[fill_mask] = "Materials and Supplies"
+    nis[lease_mask] = "Lease and Rent"
+    df["NIS Level 0 Desc"] = nis
+    print(f"  Set NIS Level for {int(fill_mask.sum()):,} rows (Valuation Class 3021)")
+    print(f"  Normalized 'Lease and Rent Total' → 'Lease and Rent': {int(lease_mask.sum()):,} rows")
+    
+    # Rename column (in place: no copy of the frame's data)
+    df.rename(columns={"NIS Level 0 Desc": "NIS Line"}, inplace=True)
     return df
 
 
+def _map_vendor_ids(vendor_ids: pd.Series) -> pd.Series:
+    """Look up VENDOR_NAME_MAPPING per distinct vendor ID (NaN where unmapped)."""
+    names = _per_distinct(
+        vendor_ids,
+        lambda ids: np.array([VENDOR_NAME_MAPPING.get(v, np.nan) for v in ids], dtype=object),
+        na_value=np.nan,
+    )
+    return pd.Series(names, index=vendor_ids.index)
+
+
 def map_vendor_names(df: pd.DataFrame) -> pd.DataFrame:
     """Map Main Vendor Name and Ultimate Vendor Name based on vendor IDs."""
+    # Single map pass per column: IDs not in the mapping keep their current name
     # Map Main Vendor Name
-    main_mask = df["Main Vendor ID"].isin(VENDOR_NAME_MAPPING.keys())
-    df.loc[main_mask, "Main Vendor Name"] = df.loc[main_mask, "Main Vendor ID"].map(VENDOR_NAME_MAPPING)
-    print(f"  Mapped {main_mask.sum():,} Main Vendor Names")
+    main_mapped = _map_vendor_ids(df["Main Vendor ID"])
+    df["Main Vendor Name"] = main_mapped.fillna(df["Main Vendor Name"])
+    print(f"  Mapped {main_mapped.notna().sum():,} Main Vendor Names")
     
     # Map Ultimate Vendor Name
-    ultimate_mask = df["Ultimate Vendor Number"].isin(VENDOR_NAME_MAPPING.keys())
-    df.loc[ultimate_mask, "Ultimate Vendor Name"] = df.loc[ultimate_mask, "Ultimate Vendor Number"].map(VENDOR_NAME_MAPPING)
-    print(f"  Mapped {ultimate_mask.sum():,} Ultimate Vendor Names")
+    ultimate_mapped = _map_vendor_ids(df["Ultimate Vendor Number"])
+    df["Ultimate Vendor Name"] = ultimate_mapped.fillna(df["Ultimate Vendor Name"])
+    print(f"  Mapped {ultimate_mapped.notna().sum():,} Ultimate Vendor Names")
     
     return df
 
 
 def map_location(df: pd.DataFrame) -> pd.DataFrame:
-    """Map Plant Code to Location."""
-    plant_code_str = df["Plant Code"].astype(str)
-    df["Location"] = plant_code_str.map(PLANT_CODE_TO_LOCATION)
+    """Map Plant Code to Location (looked up once per distinct plant code)."""
+    # Keys are text, so codes are matched by their str() form (e.g. 1234.0 -> "1234.0")
+    locations = _per_distinct(
+        df["Plant Code"],
+        lambda codes: np.array([PLANT_CODE_TO_LOCATION.get(str(c), np.nan) for c in codes], dtype=object),
+        na_value=np.nan,
+    )
+    df["Location"] = locations
     mapped_count = df["Location"].notna().sum()
     print(f"  Created Location column: {mapped_count:,} mapped")
     return df
@@ -111,25 +219,27 @@ def consolidate_delivery_dates(df: pd.DataFrame) -> pd.DataFrame:
     requested_col = "PO Current Supplier Requested Delivery Date"
     promised_col = "PO Current Supplier Promised Date"
     
-    df["Expected Delivery Date"] = df[promised_col].where(
-        df[promised_col].notna() & (df[promised_col] != ""), 
-        df[requested_col]
-    )
+    # Promised date wins when present and non-empty (mask computed once)
+    promised = df[promised_col].to_numpy()
+    has_promised = pd.notna(promised) & (promised != "")
+    df["Expected Delivery Date"] = np.where(has_promised, promised, df[requested_col].to_numpy())
     
     # Remove original columns
-    df = df.drop(columns=[requested_col, promised_col])
-    print(f"  Created 'Expected Delivery Date' column")
+    df.drop(columns=[requested_col, promised_col], inplace=True)
+    print(f"  Created 'Expected Delivery Date' column ({int(has_promised.sum()):,} from promised date)")
     return df
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
+    """Save the cleaned DataFrame (CSV, or Parquet if configured)."""
     filepath.parent.mkdir(parents=True, exist_ok=True)
     # Sort by PO Line ID for deterministic output (avoids hash randomization issues)
     df = df.sort_values("PO Line ID").reset_index(drop=True)
-    df.to_csv(filepath, index=False)
+    write_intermediate(df, filepath)
     print(f"  Saved to: {filepath}")
     print(f"  Final row count: {len(df):,}")
+    # Unit price lookup for 02/03, written after the CSV so it is never older
+    write_unit_price_sidecar(df, filepath)
 
 
 def main():
@@ -137,29 +247,21 @@ def main():
     print("Stage 1: Clean PO Line Items")
     print("=" * 60)
     
-    print("\n[1/8] Loading data...")
-    df = load_data(INPUT_FILE)
-    
-    print("\n[2/8] Filtering valuation classes...")
-    df = filter_valuation_classes(df)
-    
-    print("\n[3/8] Filtering NIS levels...")
-    df = filter_nis_levels(df)
-    
-    print("\n[4/8] Filling NIS for Valuation Class 3021...")
-    df = fill_nis_level_for_3021(df)
+    print("\n[1/5] Loading data (excluding filtered valuation classes and NIS levels)...")
+    df = load_filtered_data(INPUT_FILE)
     
-    print("\n[5/8] Transforming NIS column...")
+    print("\n[2/5] Filling and normalizing NIS column...")
     df = transform_nis_column(df)
     
-    print("\n[6/8] Mapping vendor names...")
+    print("\n[3/5] Mapping vendor names...")
     df = map_vendor_names(df)
     
-    print("\n[7/8] Mapping locations...")
+    print("\n[4/5] Mapping locations...")
     df = map_location(df)
     
-    print("\n[8/8] Consolidating delivery dates...")
+    print("\n[5/5] Consolidating delivery dates...")
     df = consolidate_delivery_dates(df)
+    df.drop(columns=[VALUATION_CLASS_NUM], inplace=True)
     
     print("\n[Save] Writing output...")
     save_data(df, OUTPUT_FILE)
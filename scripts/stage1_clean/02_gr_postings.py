@@ -13,20 +13,30 @@ Output: data/intermediate/gr_postings.csv
 import sys
 from pathlib import Path
 
+# Add scripts directory to path for utils imports
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import numpy as np
 import pandas as pd
+from utils.csv_io import read_csv, write_csv
+from utils.intermediates import intermediate_path, write_intermediate
+from utils.unit_prices import get_lookup_positions, load_unit_price_lookup
 
 # Paths
-SCRIPTS_DIR = Path(__file__).parent.parent
 PROJECT_ROOT = SCRIPTS_DIR.parent
 INPUT_FILE = PROJECT_ROOT / "data" / "raw" / "gr table.csv"
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv"
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv")
+
+# Only these raw columns are used downstream
+INPUT_COLUMNS = ["PO Line ID", "GR Posting Date", "GR Effective Quantity"]
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw CSV file."""
+    """Load the raw CSV file (needed columns only, multi-threaded pyarrow parser when available)."""
     print(f"Loading data from: {filepath}")
-    df = pd.read_csv(filepath)
+    df = read_csv(filepath, columns=INPUT_COLUMNS)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
     return df
 
@@ -34,7 +44,8 @@ def load_data(filepath: Path) -> pd.DataFrame:
 def filter_zero_quantity(df: pd.DataFrame) -> pd.DataFrame:
     """Remove rows with zero GR Effective Quantity."""
     initial_count = len(df)
-    df_filtered = df[df["GR Effective Quantity"] != 0].copy()
+    # No .copy(): calculate_gr_amount re-selects columns into a new frame
+    df_filtered = df.loc[df["GR Effective Quantity"].to_numpy() != 0]
     removed_count = initial_count - len(df_filtered)
     print(f"  Removed {removed_count:,} rows with zero quantity")
     return df_filtered
@@ -45,34 +56,36 @@ def calculate_gr_amount(df: pd.DataFrame) -> pd.DataFrame:
     Calculate GR Amount based on unit price from PO Line Items.
     Formula: GR Amount = (Purchase Value USD / Ordered Quantity) * GR Effective Quantity
     """
-    # Load PO line items to get unit prices
-    print(f"  Loading unit prices from: {PO_LINE_ITEMS_FILE}")
-    po_df = pd.read_csv(PO_LINE_ITEMS_FILE)
-    
-    # Calculate unit price for each PO Line ID
-    po_df["Unit Price"] = po_df["Purchase Value USD"] / po_df["Ordered Quantity"]
-    unit_price_lookup = po_df[["PO Line ID", "Unit Price"]].drop_duplicates()
+    # Load unit prices (Parquet sidecar from 01_po_line_items.py, or CSV fallback)
+    unit_price_lookup = load_unit_price_lookup(PO_LINE_ITEMS_FILE)
     print(f"  Unit price lookup: {len(unit_price_lookup):,} PO Line IDs")
     
-    # Merge with GR table (inner join to keep only matching PO Line IDs)
+    # Look up unit price per row (inner-join semantics: rows with no matching
+    # PO Line ID are dropped). A single indexed probe replaces a full merge.
     initial_count = len(df)
-    df = df.merge(unit_price_lookup, on="PO Line ID", how="inner")
-    dropped_count = initial_count - len(df)
+    positions = get_lookup_positions(unit_price_lookup, df["PO Line ID"])
+    matched = positions >= 0
+    dropped_count = initial_count - int(matched.sum())
     print(f"  Dropped {dropped_count:,} rows with no matching PO Line ID")
     
-    # Calculate GR Amount
-    df["GR Amount"] = (df["Unit Price"] * df["GR Effective Quantity"]).round(2)
-    
     # Keep only needed columns
-    df = df[["PO Line ID", "GR Posting Date", "GR Effective Quantity", "GR Amount"]]
+    df = df.loc[matched, ["PO Line ID", "GR Posting Date", "GR Effective Quantity"]]
+    
+    # Calculate GR Amount
+    # Multiply and round in place on the gathered copy to avoid extra temporaries
+    # (errstate matches pandas: inf/NaN unit prices propagate silently)
+    amount = unit_price_lookup.to_numpy(dtype="float64")[positions[matched]]
+    with np.errstate(invalid="ignore", over="ignore"):
+        np.multiply(amount, df["GR Effective Quantity"].to_numpy(dtype="float64"), out=amount)
+    np.round(amount, 2, out=amount)
+    df["GR Amount"] = amount
     
     return df
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False)
+    """Save the cleaned DataFrame (pyarrow CSV writer, or Parquet if configured)."""
+    write_intermediate(df, filepath, csv_writer=write_csv)
     print(f"  Saved to: {filepath}")
     print(f"  Final row count: {len(df):,}")
 
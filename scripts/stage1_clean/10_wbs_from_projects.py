@@ -27,7 +27,9 @@ sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd
 from config.column_mappings import OPS_DISTRICT_TO_LOCATION
-from utils.xlsx_cache import XlsxCacheManager
+from utils.frames import take_rows
+from utils.text import has_text
+from utils.xlsx_cache import EXCEL_ENGINE, XlsxCacheManager
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
@@ -66,7 +68,8 @@ def find_input_file() -> Optional[Path]:
 def load_data(filepath: Path) -> pd.DataFrame:
     """Load the Excel file and select relevant columns."""
     print(f"Loading data from: {filepath.name}")
-    df = pd.read_excel(filepath)
+    # Only the source columns are converted (missing ones are reported below)
+    df = pd.read_excel(filepath, usecols=lambda col: col in SOURCE_COLUMNS, engine=EXCEL_ENGINE)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
     
     # Keep only relevant columns
@@ -75,7 +78,7 @@ def load_data(filepath: Path) -> pd.DataFrame:
     if missing_cols:
         print(f"  WARNING: Missing columns: {missing_cols}")
     
-    df = df[available_cols].copy()
+    df = df.loc[:, available_cols]  # new frame; no extra .copy() needed
     print(f"  Selected {len(available_cols)} columns for WBS extraction")
     return df
 
@@ -86,8 +89,8 @@ def filter_rows_with_wbs(df: pd.DataFrame) -> pd.DataFrame:
     wbs_col = "SAP WBS # / SO #"
     
     # Keep rows where WBS column is not null/empty
-    mask = df[wbs_col].notna() & (df[wbs_col].astype(str).str.strip() != "")
-    df_filtered = df[mask].copy()
+    mask = has_text(df[wbs_col])
+    df_filtered = take_rows(df, mask)
     
     removed_count = initial_count - len(df_filtered)
     print(f"  Removed {removed_count:,} rows without WBS data")
@@ -131,13 +134,10 @@ def map_location(df: pd.DataFrame) -> pd.DataFrame:
 
 def determine_rig(df: pd.DataFrame) -> pd.DataFrame:
     """Determine rig value - use Rigs column, fallback to Project Type."""
-    df["rig"] = df["rigs"].where(
-        df["rigs"].notna() & (df["rigs"].astype(str).str.strip() != ""),
-        df["project_type"]
-    )
+    from_rigs = has_text(df["rigs"])
+    df["rig"] = df["rigs"].where(from_rigs, df["project_type"])
     
-    from_rigs = df["rigs"].notna() & (df["rigs"].astype(str).str.strip() != "")
-    from_type = (~from_rigs) & df["project_type"].notna()
+    from_type = (~from_rigs) & df["project_type"].notna().to_numpy()
     
     print(f"  Rig from 'Rigs' column: {from_rigs.sum():,} rows")
     print(f"  Rig from 'Project Type' fallback: {from_type.sum():,} rows")
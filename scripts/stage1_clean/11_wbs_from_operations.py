@@ -29,7 +29,9 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd
-from utils.xlsx_cache import XlsxCacheManager
+from utils.frames import take_rows
+from utils.text import has_text
+from utils.xlsx_cache import EXCEL_ENGINE, XlsxCacheManager
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
@@ -66,7 +68,8 @@ def find_input_file() -> Optional[Path]:
 def load_data(filepath: Path) -> pd.DataFrame:
     """Load the Excel file and select relevant columns."""
     print(f"Loading data from: {filepath.name}")
-    df = pd.read_excel(filepath)
+    # Only the source columns are converted (missing ones are reported below)
+    df = pd.read_excel(filepath, usecols=lambda col: col in SOURCE_COLUMNS, engine=EXCEL_ENGINE)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
     
     # Keep only relevant columns
@@ -75,7 +78,7 @@ def load_data(filepath: Path) -> pd.DataFrame:
     if missing_cols:
         print(f"  WARNING: Missing columns: {missing_cols}")
     
-    df = df[available_cols].copy()
+    df = df.loc[:, available_cols]  # new frame; no extra .copy() needed
     print(f"  Selected {len(available_cols)} columns for WBS extraction")
     return df
 
@@ -86,8 +89,8 @@ def filter_rows_with_wbs(df: pd.DataFrame) -> pd.DataFrame:
     wbs_col = "SAP WBS # / SO #"
     
     # Keep rows where WBS column is not null/empty
-    mask = df[wbs_col].notna() & (df[wbs_col].astype(str).str.strip() != "")
-    df_filtered = df[mask].copy()
+    mask = has_text(df[wbs_col])
+    df_filtered = take_rows(df, mask)
     
     removed_count = initial_count - len(df_filtered)
     print(f"  Removed {removed_count:,} rows without WBS data ({removed_count/initial_count*100:.1f}%)")
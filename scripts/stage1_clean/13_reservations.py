@@ -13,19 +13,30 @@ Reads raw reservations Excel file and performs:
    - Strips leading zeros from line numbers (e.g., "4584632148-00001" -> "4584632148-1")
    - Cleans PO numbers (removes .0 suffix from float conversion)
 
+Caching: Only reprocesses xlsx if:
+- Source file changed (different filename, mtime, or size)
+- Script code changed
+- Use --force to bypass cache
+
 Dependencies: None (independent stage 1 script)
 Input: data/raw/reservations/Data Table - Open Reservation - *.xlsx
 Output: data/intermediate/reservations.csv
 """
 
+import argparse
 import sys
 from pathlib import Path
+from typing import Callable
 
 # Add scripts directory to path for config imports
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+import numpy as np  # noqa: E402
 import pandas as pd  # noqa: E402
+from utils.frames import take_rows  # noqa: E402
+from utils.intermediates import intermediate_path, write_intermediate  # noqa: E402
+from utils.xlsx_cache import EXCEL_ENGINE, XlsxCacheManager, find_latest_xlsx  # noqa: E402
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
@@ -33,30 +44,56 @@ INPUT_DIR = PROJECT_ROOT / "data" / "raw" / "reservations"
 INPUT_PATTERN = (
     "Data Table - Open Reservation - Supply Element Availability Status*.xlsx"
 )
-OUTPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "reservations.csv"
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "reservations.csv")
+
+# Columns used here or by stage3 10_prepare_reservations.py (others are not loaded)
+SOURCE_COLUMNS = [
+    "Reservation -Line",
+    "Business Line by Profit Center",
+    "Business Line - By Cost Center",
+    "Main - PO Line to Peg to Reservation",
+    "Main - PO to Peg to Reservation",
+    "Creation Date",
+    "Requirements Date",
+    "Material",
+    "Material Description",
+    "Open Qty - Reservation",
+    "Open Reservation Value",
+    "Combined SOH & PO Pegging",
+    "Reservation Creation type",
+    "WBS Element",
+    "Goods recipient",
+    "Plant",
+    "Maximo Asset Num",
+]
 
 
 def find_input_file() -> Path:
     """Find the reservations input file using glob pattern."""
-    matches = list(INPUT_DIR.glob(INPUT_PATTERN))
-    if not matches:
+    # Most recently modified file if multiple match (same pick as the cache check)
+    match = find_latest_xlsx(INPUT_DIR, INPUT_PATTERN)
+    if match is None:
         raise FileNotFoundError(
             f"No file matching '{INPUT_PATTERN}' found in {INPUT_DIR}"
         )
-    # Use the most recently modified file if multiple matches
-    matches.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return matches[0]
+    return match
 
 
 # Business lines to exclude when both columns match
 EXCLUDED_MATCHING_BUSINESS_LINES = {"WCM", "WCF", "WCD"}
+_EXCLUDED_BUSINESS_LINE_ORDER = sorted(EXCLUDED_MATCHING_BUSINESS_LINES)
+_MISSING_BUSINESS_LINE = -2
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
-    """Load the raw Excel file."""
+    """Load the raw Excel file (source columns only, in file order)."""
     print(f"Loading data from: {filepath.name}")
-    df = pd.read_excel(filepath)
+    df = pd.read_excel(filepath, usecols=lambda col: col in SOURCE_COLUMNS, engine=EXCEL_ENGINE)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
+
+    missing_cols = set(SOURCE_COLUMNS) - set(df.columns)
+    if missing_cols:
+        print(f"  WARNING: Missing columns: {sorted(missing_cols)}")
     return df
 
 
@@ -76,23 +113,25 @@ def split_reservation_line_id(df: pd.DataFrame) -> pd.DataFrame:
     # Keep original as reservation_line_id
     df["reservation_line_id"] = df[source_col].astype(str)
 
-    # Split from right on last hyphen (safer if reservation number contains hyphens)
-    def extract_parts(val):
-        if pd.isna(val) or val == "nan":
-            return pd.NA, pd.NA
-        val_str = str(val)
-        if "-" in val_str:
-            idx = val_str.rfind("-")
-            return val_str[:idx], val_str[idx + 1 :]
-        return val_str, pd.NA
-
-    parts = df[source_col].apply(extract_parts)
-    df["reservation_number"] = parts.apply(lambda x: x[0]).astype(
+    # Split from right on last hyphen (safer if reservation number contains hyphens).
+    # One str.rpartition per value of the text built above, no per-row apply:
+    # ("6086214878", "-", "1"), or ("", "", value) when there is no hyphen.
+    split = [value.rpartition("-") for value in df["reservation_line_id"].to_numpy()]
+    number = np.array([head if hyphen else tail for head, hyphen, tail in split], dtype=object)
+    line = np.array([tail if hyphen else pd.NA for head, hyphen, tail in split], dtype=object)
+    is_null = (df[source_col].isna() | (df[source_col] == "nan")).to_numpy()
+    number[is_null] = pd.NA
+    line[is_null] = pd.NA
+
+    df["reservation_number"] = pd.Series(number, index=df.index).astype(
         "string"
     )  # Keep as string
-    df["reservation_line_number"] = pd.to_numeric(
-        parts.apply(lambda x: x[1]), errors="coerce"
-    ).astype("Int64")  # Nullable integer type
+    # Line numbers repeat across reservations: parse each distinct value once
+    codes, uniques = pd.factorize(line)
+    line_numbers = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").astype(
+        "Int64"
+    )  # Nullable integer type
+    df["reservation_line_number"] = line_numbers.array.take(codes, allow_fill=True)
 
     # Log results
     valid_splits = df["reservation_line_number"].notna().sum()
@@ -106,6 +145,35 @@ def split_reservation_line_id(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _apply_to_distinct_text(values: pd.Series, func: Callable[[str], str]) -> pd.Series:
+    """
+    Return func(str(value)) per row, with pd.NA where the value is null or "nan".
+
+    PO numbers and PO Line IDs repeat across reservations, so func runs once
+    per distinct value and the results are broadcast through factorize codes.
+    """
+    if values.empty:
+        return values.copy()  # same as Series.apply on an empty column
+    if values.dtype == object:
+        # Factorize the text: distinct objects such as 1 and 1.0 print differently
+        text = values.astype(str)
+        codes, uniques = pd.factorize(text)
+        is_null = values.isna().to_numpy() | (text == "nan").to_numpy()
+    elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+        # Numeric columns: stringify only the distinct values. Floats are
+        # factorized on their bits, since -0.0 == 0.0 but prints differently.
+        raw = values.to_numpy()
+        keys = raw.view(np.int64) if raw.dtype == np.float64 else raw
+        codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+        uniques = [str(value) for value in uniques.view(raw.dtype)]
+        is_null = pd.isna(raw)
+    else:
+        return values.apply(lambda val: pd.NA if pd.isna(val) or str(val) == "nan" else func(str(val)))
+    results = np.array([func(value) for value in uniques], dtype=object)[codes]
+    results[is_null] = pd.NA
+    return pd.Series(results, index=values.index)
+
+
 def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize PO Line IDs to match po_line_items format.
@@ -118,11 +186,8 @@ def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
     po_line_col = "Main - PO Line to Peg to Reservation"
     po_num_col = "Main - PO to Peg to Reservation"
 
-    def normalize_po_line_id(val):
+    def normalize_po_line_id(val_str: str) -> str:
         """Strip leading zeros from line number part of PO Line ID."""
-        if pd.isna(val) or str(val) == "nan":
-            return pd.NA
-        val_str = str(val)
         if "-" not in val_str:
             return val_str
         # Split from right on last hyphen
@@ -136,11 +201,8 @@ def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
         except ValueError:
             return val_str  # Return as-is if line number isn't numeric
 
-    def clean_po_number(val):
+    def clean_po_number(val_str: str) -> str:
         """Remove .0 suffix from PO numbers (artifact of float conversion)."""
-        if pd.isna(val) or str(val) == "nan":
-            return pd.NA
-        val_str = str(val)
         if val_str.endswith(".0"):
             return val_str[:-2]
         return val_str
@@ -148,18 +210,32 @@ def normalize_po_line_ids(df: pd.DataFrame) -> pd.DataFrame:
     # Normalize PO Line ID column
     if po_line_col in df.columns:
         original_non_null = df[po_line_col].notna().sum()
-        df[po_line_col] = df[po_line_col].apply(normalize_po_line_id)
+        df[po_line_col] = _apply_to_distinct_text(df[po_line_col], normalize_po_line_id)
         print(f"  Normalized {original_non_null:,} PO Line IDs (stripped zero-padding)")
 
     # Clean PO Number column
     if po_num_col in df.columns:
         original_non_null = df[po_num_col].notna().sum()
-        df[po_num_col] = df[po_num_col].apply(clean_po_number)
+        df[po_num_col] = _apply_to_distinct_text(df[po_num_col], clean_po_number)
         print(f"  Cleaned {original_non_null:,} PO Numbers (removed .0 suffix)")
 
     return df
 
 
+def _business_line_codes(values: pd.Series) -> np.ndarray:
+    """
+    Position of each value in _EXCLUDED_BUSINESS_LINE_ORDER after strip/upper.
+
+    -1 where the value is not an excluded business line, _MISSING_BUSINESS_LINE
+    where it is null. Business lines are a handful of codes, so only the
+    distinct values are normalized and rows map through factorize codes.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = pd.Series(uniques, dtype=object).astype("string").str.strip().str.upper()
+    unique_codes = pd.Index(_EXCLUDED_BUSINESS_LINE_ORDER).get_indexer(normalized.astype(object))
+    return np.append(unique_codes, _MISSING_BUSINESS_LINE)[codes]
+
+
 def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove rows where both Business Line columns have the same value
@@ -169,16 +245,16 @@ def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
     """
     initial_count = len(df)
 
-    # Normalize columns (strip whitespace, uppercase) while preserving NaN
-    # Using .str accessor directly preserves NaN values (won't compare equal)
-    pc = df["Business Line by Profit Center"].astype("string").str.strip().str.upper()
-    cc = df["Business Line - By Cost Center"].astype("string").str.strip().str.upper()
+    # Position of each (stripped, uppercased) business line in the target list
+    pc = _business_line_codes(df["Business Line by Profit Center"])
+    cc = _business_line_codes(df["Business Line - By Cost Center"])
 
-    # Identify rows to exclude: both columns match AND value is in target set
-    exclude_mask = (pc == cc) & pc.isin(EXCLUDED_MATCHING_BUSINESS_LINES)
+    # Identify rows to exclude: both columns match AND value is in target set.
+    # A blank Cost Center is not a mismatch (NA comparison), so it is excluded too.
+    exclude_mask = (pc >= 0) & ((pc == cc) | (cc == _MISSING_BUSINESS_LINE))
 
     # Keep rows that DON'T match the exclusion criteria
-    df_filtered = df[~exclude_mask].copy()
+    df_filtered = take_rows(df, ~exclude_mask)
 
     removed_count = initial_count - len(df_filtered)
     bl_list = ", ".join(sorted(EXCLUDED_MATCHING_BUSINESS_LINES))
@@ -186,8 +262,8 @@ def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
 
     # Log breakdown of removed rows
     if removed_count > 0:
-        for bl in sorted(EXCLUDED_MATCHING_BUSINESS_LINES):
-            bl_count = ((pc == bl) & (cc == bl)).sum()
+        for code, bl in enumerate(_EXCLUDED_BUSINESS_LINE_ORDER):
+            bl_count = ((pc == code) & (cc == code)).sum()
             if bl_count > 0:
                 print(f"    - {bl}: {bl_count:,} rows")
 
@@ -195,18 +271,44 @@ def filter_matching_business_lines(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the cleaned DataFrame to CSV."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False)
+    """
+    Save the cleaned DataFrame (CSV via pandas, or Parquet if configured).
+
+    Not utils.csv_io.write_csv: it writes integral floats without ".0", so a
+    float "Open Qty - Reservation" (e.g. float only because of filtered NaN
+    rows) would read back as int and reach sap_reservations.csv as "5" instead
+    of "5.0". These columns are int or float depending on the source, so a
+    pinned read dtype cannot preserve them either.
+    """
+    write_intermediate(df, filepath)
     print(f"  Saved to: {filepath.name}")
     print(f"  Final row count: {len(df):,}")
 
 
-def main():
+def main(force: bool = False) -> bool:
     print("=" * 60)
     print("Stage 1: Clean Reservations")
     print("=" * 60)
 
+    cache = XlsxCacheManager(
+        source_dir=INPUT_DIR,
+        source_pattern=INPUT_PATTERN,
+        output_file=OUTPUT_FILE,
+        script_path=Path(__file__),
+    )
+
+    print("\n[0/5] Checking cache...")
+    if not force and cache.is_valid():
+        print("\n  Using cached output (xlsx unchanged)")
+        print(f"  {cache.get_cache_info()}")
+        print("\n" + "=" * 60)
+        print("Stage 1 Complete: Reservations cleaned (cached)")
+        print("=" * 60)
+        return True
+
+    if force:
+        print("  Cache bypassed (--force flag)")
+
     print("\n[1/5] Loading data...")
     input_file = find_input_file()
     df = load_data(input_file)
@@ -223,6 +325,9 @@ def main():
     print("\n[5/5] Saving output...")
     save_data(df, OUTPUT_FILE)
 
+    # Save cache metadata
+    cache.save_metadata()
+
     print("\n" + "=" * 60)
     print("Stage 1 Complete: Reservations cleaned")
     print("=" * 60)
@@ -230,5 +335,13 @@ def main():
 
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Clean SAP reservations export")
+    parser.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Force processing even if cache is valid",
+    )
+    args = parser.parse_args()
+
+    success = main(force=args.force)
     sys.exit(0 if success else 1)
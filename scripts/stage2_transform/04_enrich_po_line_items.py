@@ -16,16 +16,46 @@ xlsx if the source file is newer than the cache.
 import sys
 from pathlib import Path
 
+# Add scripts directory to path for utils imports
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import numpy as np
 import pandas as pd
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.xlsx_cache import EXCEL_ENGINE
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Paths
-SCRIPTS_DIR = Path(__file__).parent.parent
 PROJECT_ROOT = SCRIPTS_DIR.parent
 PO_DETAILS_FILE = PROJECT_ROOT / "data" / "raw" / "po details report.xlsx"
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
 # Cache for enrichment data extracted from xlsx (speeds up subsequent runs)
 ENRICHMENT_CACHE_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_details_enrichment.csv"
 
+# Only these PO Details Report columns are materialized from the xlsx
+PO_DETAILS_COLUMNS = [
+    'PO Number',
+    'PO Line Item',
+    'ARIBA shopping cart number : created by (Text)',
+    'Purchase Requisition Number',
+    'ARIBA Shopping cart number',
+    'Purchase Requisition Item',
+]
+
+# M&S Prime PR Numbers: 10 digits starting with 4
+MS_PRIME_PR_LENGTH = 10
+
+# Columns joined onto PO line items
+ENRICHMENT_COLUMNS = ['Requester', 'PR Number', 'PR Line']
+
 
 def is_cache_fresh() -> bool:
     """Check if enrichment cache exists and is newer than the xlsx source."""
@@ -43,7 +73,7 @@ def is_cache_fresh() -> bool:
 def load_enrichment_from_cache() -> pd.DataFrame:
     """Load enrichment data from cache CSV."""
     print(f"Loading enrichment data from cache: {ENRICHMENT_CACHE_FILE.name}")
-    df = pd.read_csv(ENRICHMENT_CACHE_FILE)
+    df = read_csv(ENRICHMENT_CACHE_FILE)
     print(f"  Loaded {len(df):,} rows from cache")
     return df
 
@@ -54,27 +84,65 @@ def save_enrichment_to_cache(enrichment: pd.DataFrame) -> None:
     print(f"  Cached enrichment data to: {ENRICHMENT_CACHE_FILE.name}")
 
 
+def build_po_line_ids(po_numbers: pd.Series, line_items: pd.Series) -> pd.Series:
+    """
+    Build 'PO Number-PO Line Item' keys (object dtype, like the intermediates).
+
+    Integer columns are formatted and joined by Arrow kernels instead of
+    per-element Python str conversion and concatenation; other dtypes (e.g.
+    float PO Numbers when the column has blanks) keep the str() formatting.
+    """
+    if (
+        PYARROW_AVAILABLE
+        and pd.api.types.is_integer_dtype(po_numbers)
+        and pd.api.types.is_integer_dtype(line_items)
+    ):
+        joined = pc.binary_join_element_wise(
+            pa.array(po_numbers).cast(pa.string()),
+            pa.array(line_items).cast(pa.string()),
+            '-',
+        )
+        return pd.Series(joined.to_numpy(zero_copy_only=False), index=po_numbers.index, dtype=object)
+    return po_numbers.astype(str) + '-' + line_items.astype(str)
+
+
 def load_po_details(filepath: Path) -> pd.DataFrame:
     """Load PO Details Report and prepare for join."""
     print(f"Loading PO Details from: {filepath}")
-    df = pd.read_excel(filepath)
+    df = pd.read_excel(filepath, sheet_name=0, usecols=PO_DETAILS_COLUMNS, engine=EXCEL_ENGINE)
     print(f"  Loaded {len(df):,} rows")
     
     # Create PO Line ID to match format
     df['PO Line Item'] = df['PO Line Item'].fillna(0).astype(int)
-    df['PO Line ID'] = df['PO Number'].astype(str) + '-' + df['PO Line Item'].astype(str)
+    df['PO Line ID'] = build_po_line_ids(df['PO Number'], df['PO Line Item'])
     
     return df
 
 
 def load_po_line_items(filepath: Path) -> pd.DataFrame:
-    """Load intermediate PO line items."""
+    """Load intermediate PO line items (multi-threaded pyarrow parser when available)."""
     print(f"Loading PO Line Items from: {filepath}")
-    df = pd.read_csv(filepath)
+    df = read_intermediate(filepath, csv_reader=read_csv)
     print(f"  Loaded {len(df):,} rows")
     return df
 
 
+def _to_text(values: pd.Series, as_integer: bool = False) -> np.ndarray:
+    """
+    Format non-null values as strings in one vectorized pass (None where missing).
+
+    as_integer truncates floats to int first, so 1.2e9 -> "1200000000".
+    """
+    arr = values.to_numpy()
+    present = pd.notna(arr)
+    result = np.full(len(arr), None, dtype=object)
+    kept = arr[present]
+    if as_integer:
+        kept = kept.astype(np.int64)
+    result[present] = kept.astype(str)
+    return result
+
+
 def extract_enrichment_data(details: pd.DataFrame) -> pd.DataFrame:
     """Extract Requester, PR Number, and PR Line from PO Details."""
     print("Extracting enrichment data...")
@@ -86,14 +154,11 @@ def extract_enrichment_data(details: pd.DataFrame) -> pd.DataFrame:
     enrichment['Requester'] = details['ARIBA shopping cart number : created by (Text)']
     
     # PR Number: Purchase Requisition Number, fallback to ARIBA Shopping cart number
-    pr_number = details['Purchase Requisition Number'].copy()
-    ariba_number = details['ARIBA Shopping cart number'].copy()
-    
-    # Convert from float to string (handle scientific notation)
-    pr_number = pr_number.apply(lambda x: str(int(x)) if pd.notna(x) else None)
-    ariba_number = ariba_number.apply(lambda x: str(x) if pd.notna(x) else None)
+    # Convert from float to string (handle scientific notation); None where missing
+    pr_number = _to_text(details['Purchase Requisition Number'], as_integer=True)
+    ariba_number = _to_text(details['ARIBA Shopping cart number'])
     
-    enrichment['PR Number'] = pr_number.where(pr_number.notna(), ariba_number)
+    enrichment['PR Number'] = np.where(pd.notna(pr_number), pr_number, ariba_number)
     
     # PR Line: Purchase Requisition Item (nullable integer)
     # SAP PR line items are typically 10, 20, 30, etc.
@@ -102,13 +167,50 @@ def extract_enrichment_data(details: pd.DataFrame) -> pd.DataFrame:
     ).astype('Int64')
     
     # Stats
-    print(f"  Requester values: {enrichment['Requester'].notna().sum():,}")
-    print(f"  PR Number values: {enrichment['PR Number'].notna().sum():,}")
-    print(f"  PR Line values: {enrichment['PR Line'].notna().sum():,}")
+    counts = enrichment[ENRICHMENT_COLUMNS].notna().sum()
+    print(f"  Requester values: {counts['Requester']:,}")
+    print(f"  PR Number values: {counts['PR Number']:,}")
+    print(f"  PR Line values: {counts['PR Line']:,}")
     
     return enrichment
 
 
+def left_join_enrichment(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
+    """
+    Left join enrichment columns onto PO line items by PO Line ID.
+
+    Enrichment keys are normally unique, so each PO Line ID is looked up once
+    in the enrichment index and the columns are gathered by position (missing
+    IDs get NA), equivalent to a left merge without its bookkeeping. Adds the
+    columns to po_df in place. Duplicate keys fall back to merge so row
+    multiplication is still caught by the caller's row count check.
+    """
+    keys = pd.Index(enrichment['PO Line ID'])
+    if not keys.is_unique:
+        return po_df.merge(enrichment, on='PO Line ID', how='left')
+    
+    positions = keys.get_indexer(po_df['PO Line ID'])
+    for col in enrichment.columns.drop('PO Line ID'):
+        po_df[col] = pd.api.extensions.take(enrichment[col].array, positions, allow_fill=True)
+    return po_df
+
+
+def is_ms_prime_pr_number(pr_numbers: pd.Series) -> np.ndarray:
+    """
+    Mask of PR Numbers that are 10 digits starting with 4 (as text).
+
+    Same rows as the regex match it replaces, including Unicode digits and
+    one trailing newline (which the regex's end anchor also accepted).
+    """
+    text = pr_numbers.astype(str).str.removesuffix("\n")
+    mask = (
+        (text.str.len() == MS_PRIME_PR_LENGTH)
+        & text.str.startswith("4")
+        & text.str[1:].str.isdecimal()
+    )
+    return mask.to_numpy()
+
+
 def enrich_data(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
     """Left join enrichment data to PO line items."""
     print("Enriching PO line items...")
@@ -116,23 +218,18 @@ def enrich_data(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
     initial_count = len(po_df)
     
     # Drop existing enrichment columns if present (from previous runs)
-    cols_to_drop = [col for col in ['Requester', 'PR Number', 'PR Line'] if col in po_df.columns]
+    cols_to_drop = [col for col in ENRICHMENT_COLUMNS if col in po_df.columns]
     if cols_to_drop:
-        po_df = po_df.drop(columns=cols_to_drop)
+        po_df.drop(columns=cols_to_drop, inplace=True)
         print(f"  Dropped existing columns: {cols_to_drop}")
     
     # Left join to preserve all PO line items
-    enriched = po_df.merge(
-        enrichment[['PO Line ID', 'Requester', 'PR Number', 'PR Line']],
-        on='PO Line ID',
-        how='left'
-    )
+    enriched = left_join_enrichment(po_df, enrichment[['PO Line ID'] + ENRICHMENT_COLUMNS])
     
     assert len(enriched) == initial_count, "Row count changed after merge!"
     
     # Set Requester to "M&S Prime" for PR Numbers starting with 4 and 10 digits
-    pr_str = enriched['PR Number'].astype(str)
-    ms_prime_mask = pr_str.str.match(r'^4\d{9}$', na=False)
+    ms_prime_mask = is_ms_prime_pr_number(enriched['PR Number'])
     enriched.loc[ms_prime_mask, 'Requester'] = 'M&S Prime'
     print(f"  Set 'M&S Prime' for {ms_prime_mask.sum():,} rows")
     
@@ -144,18 +241,19 @@ def enrich_data(po_df: pd.DataFrame, enrichment: pd.DataFrame) -> pd.DataFrame:
         print(f"  Set 'FMT' for {is_ops_vendor.sum():,} rows (OPS vendor category)")
     
     # Stats
-    print(f"  Rows with Requester: {enriched['Requester'].notna().sum():,}")
-    print(f"  Rows with PR Number: {enriched['PR Number'].notna().sum():,}")
-    print(f"  Rows with PR Line: {enriched['PR Line'].notna().sum():,}")
+    counts = enriched[ENRICHMENT_COLUMNS].notna().sum()
+    print(f"  Rows with Requester: {counts['Requester']:,}")
+    print(f"  Rows with PR Number: {counts['PR Number']:,}")
+    print(f"  Rows with PR Line: {counts['PR Line']:,}")
     
     return enriched
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save enriched DataFrame to CSV."""
+    """Save enriched DataFrame (CSV, or Parquet if configured)."""
     # Sort by PO Line ID for deterministic output (avoids hash randomization issues)
-    df = df.sort_values("PO Line ID").reset_index(drop=True)
-    df.to_csv(filepath, index=False)
+    df = df.sort_values("PO Line ID", ignore_index=True)
+    write_intermediate(df, filepath)
     print(f"  Saved to: {filepath}")
     print(f"  Final row count: {len(df):,}")
 
@@ -18,27 +18,35 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd
-from config.column_mappings import SIMPLE_VENDOR_CATEGORY, SIMPLE_ACCOUNT_CATEGORIES
+from config.column_mappings import (
+    SIMPLE_VENDOR_CATEGORY,
+    SIMPLE_ACCOUNT_CATEGORIES,
+    GR_POSTINGS_DTYPES,
+    IR_POSTINGS_DTYPES,
+)
+from utils.csv_io import write_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.unit_prices import build_unit_price_lookup
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
-GR_POSTINGS_FILE = PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv"
-IR_POSTINGS_FILE = PROJECT_ROOT / "data" / "intermediate" / "ir_postings.csv"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv"
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
+GR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv")
+IR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "ir_postings.csv")
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv")
 
 
 def load_data():
     """Load all required data files."""
     print("Loading data files...")
     
-    po_df = pd.read_csv(PO_LINE_ITEMS_FILE)
+    po_df = read_intermediate(PO_LINE_ITEMS_FILE)
     print(f"  PO Line Items: {len(po_df):,} rows")
     
-    gr_df = pd.read_csv(GR_POSTINGS_FILE)
+    gr_df = read_intermediate(GR_POSTINGS_FILE, dtype=GR_POSTINGS_DTYPES)
     print(f"  GR Postings: {len(gr_df):,} rows")
     
-    ir_df = pd.read_csv(IR_POSTINGS_FILE)
+    ir_df = read_intermediate(IR_POSTINGS_FILE, dtype=IR_POSTINGS_DTYPES)
     print(f"  IR Postings: {len(ir_df):,} rows")
     
     return po_df, gr_df, ir_df
@@ -50,14 +58,17 @@ def classify_po_line_items(po_df: pd.DataFrame) -> tuple:
     
     Type 1 (Simple): Vendor Category = GLD AND Account Category IN (K, P, S, V)
     Type 2 (Complex): All others
+
+    Returns the distinct PO Line IDs of each type as Series; callers filter
+    postings with Series.isin, which hashes them in C (no Python set).
     """
     is_gld = po_df["Main Vendor SLB Vendor Category"] == SIMPLE_VENDOR_CATEGORY
     is_valid_cat = po_df["PO Account Assignment Category"].isin(SIMPLE_ACCOUNT_CATEGORIES)
     
     simple_mask = is_gld & is_valid_cat
     
-    simple_po_ids = set(po_df.loc[simple_mask, "PO Line ID"])
-    complex_po_ids = set(po_df.loc[~simple_mask, "PO Line ID"])
+    simple_po_ids = po_df.loc[simple_mask, "PO Line ID"].drop_duplicates()
+    complex_po_ids = po_df.loc[~simple_mask, "PO Line ID"].drop_duplicates()
     
     print(f"  Type 1 (Simple): {len(simple_po_ids):,} PO Line IDs")
     print(f"  Type 2 (Complex): {len(complex_po_ids):,} PO Line IDs")
@@ -65,7 +76,7 @@ def classify_po_line_items(po_df: pd.DataFrame) -> tuple:
     return simple_po_ids, complex_po_ids
 
 
-def calculate_simple_cost_impact(gr_df: pd.DataFrame, simple_po_ids: set) -> pd.DataFrame:
+def calculate_simple_cost_impact(gr_df: pd.DataFrame, simple_po_ids: pd.Series) -> pd.DataFrame:
     """
     Type 1: Cost impact = GR postings only (IR ignored).
     """
@@ -85,7 +96,7 @@ def calculate_simple_cost_impact(gr_df: pd.DataFrame, simple_po_ids: set) -> pd.
 
 
 def calculate_complex_cost_impact(gr_df: pd.DataFrame, ir_df: pd.DataFrame, 
-                                   complex_po_ids: set, po_df: pd.DataFrame) -> pd.DataFrame:
+                                   complex_po_ids: pd.Series, po_df: pd.DataFrame) -> pd.DataFrame:
     """
     Type 2: Cost impact based on GR/IR chronological processing.
     """
@@ -115,51 +126,58 @@ def calculate_complex_cost_impact(gr_df: pd.DataFrame, ir_df: pd.DataFrame,
     combined = combined.sort_values(["PO Line ID", "Posting Date", "Posting Type"])
     
     # Get unit prices
-    po_df["Unit Price"] = po_df["Purchase Value USD"] / po_df["Ordered Quantity"]
-    unit_prices = po_df.set_index("PO Line ID")["Unit Price"].to_dict()
-    
-    # Process each PO Line ID
-    results = []
-    
-    for po_line_id, group in combined.groupby("PO Line ID"):
-        cumulative_gr = 0
-        cumulative_ir = 0
-        last_cumulative = 0
-        unit_price = unit_prices.get(po_line_id, 0)
+    unit_prices = build_unit_price_lookup(po_df).to_dict()
+    
+    # Process each PO Line ID: postings are sorted by PO Line ID, so one walk
+    # over plain lists resets the running totals whenever the ID changes.
+    # Same sequential float arithmetic as a per-group iterrows loop, without
+    # building a Series per row. (groupby skipped null IDs, so do we.)
+    combined = combined[combined["PO Line ID"].notna()]
+    po_line_ids = combined["PO Line ID"].tolist()
+    posting_types = combined["Posting Type"].tolist()
+    posting_qtys = combined["Posting Qty"].tolist()
+    cost_impact_qtys = []
+    cost_impact_amounts = []
+    current_id = None
+    
+    for po_line_id, posting_type, posting_qty in zip(po_line_ids, posting_types, posting_qtys):
+        if po_line_id != current_id:
+            current_id = po_line_id
+            cumulative_gr = 0
+            cumulative_ir = 0
+            last_cumulative = 0
+            unit_price = unit_prices.get(po_line_id, 0)
+        
+        if posting_type == "GR":
+            cumulative_gr += posting_qty
+            reference = cumulative_gr if cumulative_gr >= cumulative_ir else max(cumulative_gr, cumulative_ir)
+        else:
+            cumulative_ir += posting_qty
+            reference = cumulative_ir if cumulative_ir >= cumulative_gr else max(cumulative_gr, cumulative_ir)
         
-        for _, row in group.iterrows():
-            posting_type = row["Posting Type"]
-            posting_qty = row["Posting Qty"]
-            
-            if posting_type == "GR":
-                cumulative_gr += posting_qty
-                reference = cumulative_gr if cumulative_gr >= cumulative_ir else max(cumulative_gr, cumulative_ir)
-            else:
-                cumulative_ir += posting_qty
-                reference = cumulative_ir if cumulative_ir >= cumulative_gr else max(cumulative_gr, cumulative_ir)
-            
-            cost_impact_qty = reference - last_cumulative
-            cost_impact_amount = round(cost_impact_qty * unit_price, 2)
-            last_cumulative += cost_impact_qty
-            
-            results.append({
-                "PO Line ID": po_line_id,
-                "Posting Date": row["Posting Date"],
-                "Posting Type": posting_type,
-                "Posting Qty": posting_qty,
-                "Cost Impact Qty": cost_impact_qty,
-                "Cost Impact Amount": cost_impact_amount,
-            })
-    
-    result_df = pd.DataFrame(results)
+        cost_impact_qty = reference - last_cumulative
+        cost_impact_amounts.append(round(cost_impact_qty * unit_price, 2))
+        cost_impact_qtys.append(cost_impact_qty)
+        last_cumulative += cost_impact_qty
+    
+    if not po_line_ids:
+        result_df = pd.DataFrame()
+    else:
+        result_df = pd.DataFrame({
+            "PO Line ID": po_line_ids,
+            "Posting Date": combined["Posting Date"].to_numpy(),
+            "Posting Type": posting_types,
+            "Posting Qty": posting_qtys,
+            "Cost Impact Qty": cost_impact_qtys,
+            "Cost Impact Amount": cost_impact_amounts,
+        })
     print(f"  Generated {len(result_df):,} complex cost impact records")
     return result_df
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save cost impact DataFrame to CSV."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False)
+    """Save cost impact DataFrame (pyarrow CSV writer, or Parquet if configured)."""
+    write_intermediate(df, filepath, csv_writer=write_csv)
     print(f"  Saved to: {filepath}")
     print(f"  Total records: {len(df):,}")
     print(f"  Total cost impact: ${df['Cost Impact Amount'].sum():,.2f}")
@@ -21,51 +21,58 @@ from datetime import date
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+import numpy as np
 import pandas as pd
 from config.column_mappings import (
     SIMPLE_VENDOR_CATEGORY, 
     SIMPLE_ACCOUNT_CATEGORIES,
     GRIR_TIME_BUCKETS,
     GRIR_TIME_BUCKET_MAX,
+    GR_POSTINGS_DTYPES,
+    IR_POSTINGS_DTYPES,
 )
+from utils.csv_io import write_csv
+from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+from utils.unit_prices import build_unit_price_lookup
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
-GR_POSTINGS_FILE = PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv"
-IR_POSTINGS_FILE = PROJECT_ROOT / "data" / "intermediate" / "ir_postings.csv"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "grir_exposures.csv"
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
+GR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "gr_postings.csv")
+IR_POSTINGS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "ir_postings.csv")
+OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "grir_exposures.csv")
 
 
 def load_data():
     """Load all required data files."""
     print("Loading data files...")
     
-    po_df = pd.read_csv(PO_LINE_ITEMS_FILE)
+    po_df = read_intermediate(PO_LINE_ITEMS_FILE)
     print(f"  PO Line Items: {len(po_df):,} rows")
     
-    gr_df = pd.read_csv(GR_POSTINGS_FILE)
+    gr_df = read_intermediate(GR_POSTINGS_FILE, dtype=GR_POSTINGS_DTYPES)
     print(f"  GR Postings: {len(gr_df):,} rows")
     
-    ir_df = pd.read_csv(IR_POSTINGS_FILE)
+    ir_df = read_intermediate(IR_POSTINGS_FILE, dtype=IR_POSTINGS_DTYPES)
     print(f"  IR Postings: {len(ir_df):,} rows")
     
     return po_df, gr_df, ir_df
 
 
-def get_simple_po_ids(po_df: pd.DataFrame) -> set:
+def get_simple_po_ids(po_df: pd.DataFrame) -> pd.Series:
     """
     Get PO Line IDs for Simple POs (GLD + K/P/S/V) that are NOT closed.
     These are the POs where we track GRIR exposure.
     
     Closed POs are excluded - no exposure if PO is already closed.
+    Returns the distinct IDs as a Series (for Series.isin, no Python set).
     """
     is_gld = po_df["Main Vendor SLB Vendor Category"] == SIMPLE_VENDOR_CATEGORY
     is_valid_cat = po_df["PO Account Assignment Category"].isin(SIMPLE_ACCOUNT_CATEGORIES)
     is_not_closed = po_df["PO Receipt Status"] != "CLOSED PO"
     
     simple_mask = is_gld & is_valid_cat & is_not_closed
-    simple_po_ids = set(po_df.loc[simple_mask, "PO Line ID"])
+    simple_po_ids = po_df.loc[simple_mask, "PO Line ID"].drop_duplicates()
     
     # Count how many were excluded due to closed status
     closed_simple = (is_gld & is_valid_cat & ~is_not_closed).sum()
@@ -75,26 +82,42 @@ def get_simple_po_ids(po_df: pd.DataFrame) -> set:
     return simple_po_ids
 
 
-def get_unit_prices(po_df: pd.DataFrame) -> dict:
-    """Calculate unit price for each PO Line ID."""
-    po_df = po_df.copy()
-    po_df["Unit Price"] = po_df["Purchase Value USD"] / po_df["Ordered Quantity"]
-    return po_df.set_index("PO Line ID")["Unit Price"].to_dict()
+# Inclusive upper bounds in ascending order, with the bucket for each
+# (days past the last bound fall into GRIR_TIME_BUCKET_MAX)
+_BUCKET_THRESHOLDS = np.array(sorted(GRIR_TIME_BUCKETS))
+_BUCKET_LABELS = np.array(
+    [GRIR_TIME_BUCKETS[t] for t in sorted(GRIR_TIME_BUCKETS)] + [GRIR_TIME_BUCKET_MAX], dtype=object
+)
+
 
+def categorize_time_buckets(days: np.ndarray) -> np.ndarray:
+    """Categorize days into time buckets (the first threshold >= days)."""
+    return _BUCKET_LABELS[np.searchsorted(_BUCKET_THRESHOLDS, days, side="left")]
 
-def categorize_time_bucket(days: int) -> str:
-    """Categorize days into time bucket."""
-    for threshold, bucket in sorted(GRIR_TIME_BUCKETS.items()):
-        if days <= threshold:
-            return bucket
-    return GRIR_TIME_BUCKET_MAX
+
+def sort_postings(combined: pd.DataFrame) -> pd.DataFrame:
+    """
+    Order postings by (PO Line ID, Posting Date, Posting Type).
+
+    Same order as sort_values on those columns, on integer keys: the object
+    IDs are only compared once per distinct value (sorted factorize), then
+    one stable lexsort orders the rows, with missing dates last within each
+    PO and GR before IR on the same date. Expects no null PO Line IDs.
+    """
+    id_keys, _ = pd.factorize(combined["PO Line ID"], sort=True)
+    posting_date = combined["Posting Date"]
+    date_keys = np.where(
+        posting_date.isna(), np.iinfo(np.int64).max, posting_date.to_numpy().view("i8")
+    )
+    type_keys = (combined["Posting Type"] == "IR").to_numpy()
+    return combined.take(np.lexsort((type_keys, date_keys, id_keys)))
 
 
 def calculate_grir_exposures(
     gr_df: pd.DataFrame, 
     ir_df: pd.DataFrame, 
-    simple_po_ids: set,
-    unit_prices: dict,
+    simple_po_ids: pd.Series,
+    unit_prices: pd.Series,
     snapshot_date: date
 ) -> pd.DataFrame:
     """
@@ -132,24 +155,36 @@ def calculate_grir_exposures(
     simple_ir["Posting Type"] = "IR"
     simple_ir = simple_ir[["PO Line ID", "Posting Date", "Posting Type", "Posting Qty"]]
     
-    # Combine and sort chronologically
+    # Combine and sort chronologically (groupby skipped null IDs, so do we)
     combined = pd.concat([simple_gr, simple_ir], ignore_index=True)
+    combined = combined[combined["PO Line ID"].notna()]
     combined["Posting Date"] = pd.to_datetime(combined["Posting Date"])
-    combined = combined.sort_values(["PO Line ID", "Posting Date", "Posting Type"])
+    combined = sort_postings(combined)
     
-    # Process each PO Line ID
+    # Process each PO Line ID: postings are sorted by PO Line ID, so each
+    # PO's postings are one contiguous run of plain lists. Same sequential
+    # float arithmetic as a per-group iterrows loop, without building a Series
+    # per row.
+    po_line_ids = combined["PO Line ID"].tolist()
+    posting_types = combined["Posting Type"].tolist()
+    posting_qtys = combined["Posting Qty"].tolist()
+    # Dates stay in the datetime array; only exposure dates become Timestamps
+    posting_dates = combined["Posting Date"].array
     results = []
+    exposure_qtys = []  # unrounded GRIR Qty per result row, for GRIR Value
     
-    for po_line_id, group in combined.groupby("PO Line ID"):
+    start = 0
+    while start < len(po_line_ids):
+        po_line_id = po_line_ids[start]
         cumulative_gr = 0.0
         cumulative_ir = 0.0
-        first_exposure_date = None
+        first_exposure = None  # position of the posting where IR first exceeded GR
         
         # Walk through postings chronologically to find first exposure
-        for _, row in group.iterrows():
-            posting_type = row["Posting Type"]
-            posting_qty = float(row["Posting Qty"])
-            posting_date = row["Posting Date"]
+        end = start
+        while end < len(po_line_ids) and po_line_ids[end] == po_line_id:
+            posting_type = posting_types[end]
+            posting_qty = float(posting_qtys[end])
             
             if posting_type == "GR":
                 cumulative_gr += posting_qty
@@ -157,49 +192,57 @@ def calculate_grir_exposures(
                 cumulative_ir += posting_qty
             
             # Track first date when IR > GR
-            if cumulative_ir > cumulative_gr and first_exposure_date is None:
-                first_exposure_date = posting_date
+            if cumulative_ir > cumulative_gr and first_exposure is None:
+                first_exposure = end
             
-            # Reset first_exposure_date if GR catches up
+            # Reset first exposure if GR catches up
             if cumulative_gr >= cumulative_ir:
-                first_exposure_date = None
+                first_exposure = None
+            end += 1
+        start = end
+        first_exposure_date = posting_dates[first_exposure] if first_exposure is not None else None
         
         # Calculate final GRIR
         grir_qty = cumulative_ir - cumulative_gr
         
         # Only record if there's a positive GRIR (exposure)
         if grir_qty > 0:
-            unit_price = unit_prices.get(po_line_id, 0)
-            grir_value = round(grir_qty * unit_price, 2)
-            
             # Calculate duration
             if first_exposure_date is not None:
                 days_open = (pd.Timestamp(snapshot_date) - first_exposure_date).days
             else:
                 days_open = 0
             
-            time_bucket = categorize_time_bucket(days_open)
-            
             results.append({
                 "PO Line ID": po_line_id,
                 "GRIR Qty": round(grir_qty, 4),
-                "GRIR Value": grir_value,
+                "GRIR Value": None,  # priced for all rows below
                 "First Exposure Date": first_exposure_date.strftime("%Y-%m-%d") if first_exposure_date else None,
                 "Days Open": days_open,
-                "Time Bucket": time_bucket,
+                "Time Bucket": None,  # assigned for all rows below
                 "Snapshot Date": snapshot_date.strftime("%Y-%m-%d"),
             })
+            exposure_qtys.append(grir_qty)
     
     result_df = pd.DataFrame(results)
+    if len(result_df) > 0:
+        # One index lookup for all exposed POs (unknown PO Line IDs price at 0)
+        positions = unit_prices.index.get_indexer(result_df["PO Line ID"])
+        prices = pd.api.extensions.take(
+            unit_prices.to_numpy(), positions, allow_fill=True, fill_value=0.0
+        )
+        result_df["GRIR Value"] = [
+            round(qty * price, 2) for qty, price in zip(exposure_qtys, prices.tolist())
+        ]
+        result_df["Time Bucket"] = categorize_time_buckets(result_df["Days Open"].to_numpy())
     print(f"  Generated {len(result_df):,} GRIR exposure records")
     
     return result_df
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save GRIR exposures DataFrame to CSV."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False)
+    """Save GRIR exposures DataFrame (pyarrow CSV writer, or Parquet if configured)."""
+    write_intermediate(df, filepath, csv_writer=write_csv)
     print(f"  Saved to: {filepath}")
     print(f"  Total records: {len(df):,}")
     if len(df) > 0:
@@ -227,7 +270,7 @@ def main():
     
     print("\n[2/4] Identifying Simple POs...")
     simple_po_ids = get_simple_po_ids(po_df)
-    unit_prices = get_unit_prices(po_df)
+    unit_prices = build_unit_price_lookup(po_df)
     
     print("\n[3/4] Calculating GRIR exposures...")
     snapshot_date = date.today()
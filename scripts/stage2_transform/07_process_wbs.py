@@ -38,8 +38,11 @@ from typing import Optional, Tuple, List
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+import numpy as np
 import pandas as pd
 from config.column_mappings import OPS_DISTRICT_TO_LOCATION, SBL_NAME_TO_CODE
+from utils.csv_io import read_csv
+from utils.intermediates import intermediate_path, write_intermediate
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
@@ -50,7 +53,7 @@ INPUT_FILES = {
     "operations": INTERMEDIATE_DIR / "wbs_from_operations.csv",
     "ops_activities": INTERMEDIATE_DIR / "wbs_from_ops_activities.csv",
 }
-OUTPUT_FILE = INTERMEDIATE_DIR / "wbs_processed.csv"
+OUTPUT_FILE = intermediate_path(INTERMEDIATE_DIR / "wbs_processed.csv")
 
 # WBS pattern: J.XX.XXXXXX (J, dot, 2 digits, dot, 6 digits)
 WBS_PATTERN = re.compile(r'J\.\d{2}\.\d{6}')
@@ -59,11 +62,11 @@ BRACKET_PATTERN = re.compile(r'\(([A-Z]+)\)')
 
 
 def load_all_sources() -> dict:
-    """Load all WBS source files."""
+    """Load all WBS source files (multi-threaded pyarrow parser when available)."""
     dfs = {}
     for name, filepath in INPUT_FILES.items():
         if filepath.exists():
-            df = pd.read_csv(filepath)
+            df = read_csv(filepath)
             print(f"  Loaded {len(df):,} rows from {filepath.name}")
             dfs[name] = df
         else:
@@ -97,6 +100,21 @@ def parse_wbs_entry(wbs_string: str) -> Tuple[Optional[str], Optional[str]]:
     return wbs_number, sbl_code
 
 
+def parse_wbs_entries(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply parse_wbs_entry to each value, returning (wbs_number, sbl_code) arrays.
+
+    WBS strings repeat across report rows, so each distinct value is parsed
+    once and the results are broadcast through factorize codes (None where
+    parsing fails or the value is missing).
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = [parse_wbs_entry(value) for value in uniques]
+    wbs_numbers = np.array([wbs for wbs, _ in parsed] + [None], dtype=object)
+    sbl_codes = np.array([sbl for _, sbl in parsed] + [None], dtype=object)
+    return wbs_numbers[codes], sbl_codes[codes]
+
+
 def to_sbl_array(codes: List[str]) -> str:
     """Convert list of SBL codes to JSON array string for CSV storage."""
     if not codes:
@@ -108,35 +126,85 @@ def to_sbl_array(codes: List[str]) -> str:
     return json.dumps(valid_codes)
 
 
+def to_sbl_arrays(values: pd.Series, multi: bool = False) -> np.ndarray:
+    """
+    Convert SBL values to JSON array strings (see to_sbl_array), None where missing.
+
+    With multi=True each value is a comma-separated list of codes, otherwise a
+    single code. SBL values repeat across report rows, so each distinct value
+    is serialized once and the results are broadcast through factorize codes.
+    """
+    codes, uniques = pd.factorize(values)
+    if multi:
+        arrays = [
+            to_sbl_array([c.strip() for c in str(value).split(",")]) if value else None
+            for value in uniques
+        ]
+    else:
+        arrays = [to_sbl_array([value]) for value in uniques]
+    return np.array(arrays + [None], dtype=object)[codes]
+
+
+def split_wbs_raw(wbs_raw) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split a comma-separated Projects WBS value into parsed entries.
+
+    Returns (wbs_number, sub_business_lines) per entry that has a WBS number,
+    with the SBL code wrapped in array format (None when absent).
+    """
+    if pd.isna(wbs_raw) or not wbs_raw:
+        return []
+    
+    entries = []
+    for entry in (w.strip() for w in str(wbs_raw).split(",")):
+        wbs_number, sbl_code = parse_wbs_entry(entry)
+        if wbs_number:
+            entries.append((wbs_number, to_sbl_array([sbl_code]) if sbl_code else None))
+    return entries
+
+
 def split_and_parse_projects(df: pd.DataFrame) -> pd.DataFrame:
     """
     Split comma-separated WBS entries in Projects and parse each.
     Each WBS gets a single SBL code wrapped in array format.
+    
+    Each distinct sap_wbs_raw value is split and parsed once; rows are then
+    repeated once per entry with a single take (no per-row copies).
     """
     if len(df) == 0:
         return df
     
     initial_count = len(df)
-    rows = []
     
-    for _, row in df.iterrows():
-        wbs_raw = row.get("sap_wbs_raw", "")
-        if pd.isna(wbs_raw) or not wbs_raw:
-            continue
-        
-        # Split by comma
-        wbs_entries = [w.strip() for w in str(wbs_raw).split(",")]
-        
-        for entry in wbs_entries:
-            wbs_number, sbl_code = parse_wbs_entry(entry)
-            if wbs_number:
-                new_row = row.copy()
-                new_row["wbs_number"] = wbs_number
-                # Store as JSON array with single element
-                new_row["sub_business_lines"] = to_sbl_array([sbl_code]) if sbl_code else None
-                rows.append(new_row)
-    
-    result = pd.DataFrame(rows)
+    if "sap_wbs_raw" in df.columns:
+        codes, uniques = pd.factorize(df["sap_wbs_raw"])
+    else:
+        codes, uniques = np.full(len(df), -1), []
+    entries = [split_wbs_raw(value) for value in uniques] + [[]]
+    
+    # Entries of all distinct values laid out end to end
+    entry_counts = np.array([len(e) for e in entries])
+    entry_starts = np.cumsum(entry_counts) - entry_counts
+    flat = [entry for value_entries in entries for entry in value_entries]
+    wbs_numbers = np.array([wbs for wbs, _ in flat], dtype=object)
+    sbl_arrays = np.array([sbl for _, sbl in flat], dtype=object)
+    
+    # Output row k repeats source row positions[k] and takes its j-th entry
+    row_counts = entry_counts[codes]
+    positions = np.repeat(np.arange(len(df)), row_counts)
+    row_starts = np.cumsum(row_counts) - row_counts
+    j = np.arange(len(positions)) - np.repeat(row_starts, row_counts)
+    flat_index = entry_starts[codes[positions]] + j
+    
+    if len(positions) == 0:
+        result = pd.DataFrame()
+    else:
+        result = df.take(positions)
+        result["wbs_number"] = wbs_numbers[flat_index]
+        result["sub_business_lines"] = sbl_arrays[flat_index]
+        # Same dtypes as rebuilding the frame from row Series
+        result = result.infer_objects()
+    
     print(f"  Projects: {initial_count:,} rows -> {len(result):,} rows (split WBS entries)")
     return result
 
@@ -152,18 +220,11 @@ def parse_operations(df: pd.DataFrame) -> pd.DataFrame:
     initial_count = len(df)
     
     # Parse WBS entries
-    parsed = df["sap_wbs_raw"].apply(lambda x: pd.Series(parse_wbs_entry(x)))
-    df["wbs_number"] = parsed[0]
+    df["wbs_number"], _ = parse_wbs_entries(df["sap_wbs_raw"])
     
     # Parse comma-separated SBL codes to array
-    def parse_sbl_codes(raw_value):
-        if pd.isna(raw_value) or not raw_value:
-            return None
-        codes = [c.strip() for c in str(raw_value).split(",")]
-        return to_sbl_array(codes)
-    
     if "sub_business_lines_raw" in df.columns:
-        df["sub_business_lines"] = df["sub_business_lines_raw"].apply(parse_sbl_codes)
+        df["sub_business_lines"] = to_sbl_arrays(df["sub_business_lines_raw"], multi=True)
         df = df.drop(columns=["sub_business_lines_raw"])
         
         sbl_filled = df["sub_business_lines"].notna().sum()
@@ -193,9 +254,7 @@ def parse_ops_activities(df: pd.DataFrame) -> pd.DataFrame:
     initial_count = len(df)
     
     # Parse WBS entries
-    parsed = df["sap_wbs_raw"].apply(lambda x: pd.Series(parse_wbs_entry(x)))
-    df["wbs_number"] = parsed[0]
-    df["sub_business_line_from_wbs"] = parsed[1]
+    df["wbs_number"], df["sub_business_line_from_wbs"] = parse_wbs_entries(df["sap_wbs_raw"])
     
     # Map full SBL names to codes
     if "sub_business_line_raw" in df.columns:
@@ -214,15 +273,13 @@ def parse_ops_activities(df: pd.DataFrame) -> pd.DataFrame:
         )
         
         # Convert to JSON array
-        df["sub_business_lines"] = sbl_code.apply(lambda x: to_sbl_array([x]) if pd.notna(x) else None)
+        df["sub_business_lines"] = to_sbl_arrays(sbl_code)
         df = df.drop(columns=["sub_business_line_raw", "sub_business_line_from_wbs", "sub_business_line_mapped"])
         
         mapped_count = df["sub_business_lines"].notna().sum()
         print(f"  Ops Activities: Mapped {mapped_count:,} SBL names to codes")
     else:
-        df["sub_business_lines"] = df["sub_business_line_from_wbs"].apply(
-            lambda x: to_sbl_array([x]) if pd.notna(x) else None
-        )
+        df["sub_business_lines"] = to_sbl_arrays(df["sub_business_line_from_wbs"])
         df = df.drop(columns=["sub_business_line_from_wbs"])
     
     # Filter out rows where WBS couldn't be parsed
@@ -316,9 +373,8 @@ def select_output_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def save_data(df: pd.DataFrame, filepath: Path) -> None:
-    """Save the processed DataFrame to CSV."""
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(filepath, index=False)
+    """Save the processed DataFrame (CSV, or Parquet if configured)."""
+    write_intermediate(df, filepath)
     print(f"  Saved to: {filepath}")
     print(f"  Final row count: {len(df):,}")
 
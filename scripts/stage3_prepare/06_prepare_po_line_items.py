@@ -18,7 +18,9 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd  # noqa: E402
-from config.column_mappings import PO_LINE_ITEMS_MAPPING  # noqa: E402
+from config.column_mappings import COST_IMPACT_DTYPES, PO_LINE_ITEMS_MAPPING  # noqa: E402
+from utils.csv_io import read_csv  # noqa: E402
+from utils.intermediates import intermediate_path, read_intermediate  # noqa: E402
 
 # Import Pandera contract for runtime validation (optional dependency)
 try:
@@ -32,8 +34,8 @@ except ImportError:
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-PO_LINE_ITEMS_FILE = PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv"
-COST_IMPACT_FILE = PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv"
+PO_LINE_ITEMS_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "po_line_items.csv")
+COST_IMPACT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv")
 WBS_DETAILS_FILE = PROJECT_ROOT / "data" / "import-ready" / "wbs_details.csv"
 OUTPUT_FILE = PROJECT_ROOT / "data" / "import-ready" / "po_line_items.csv"
 
@@ -42,10 +44,10 @@ def load_data():
     """Load intermediate data files."""
     print("Loading intermediate data...")
 
-    po_df = pd.read_csv(PO_LINE_ITEMS_FILE)
+    po_df = read_intermediate(PO_LINE_ITEMS_FILE)
     print(f"  PO Line Items: {len(po_df):,} rows")
 
-    cost_df = pd.read_csv(COST_IMPACT_FILE)
+    cost_df = read_intermediate(COST_IMPACT_FILE, dtype=COST_IMPACT_DTYPES)
     print(f"  Cost Impact: {len(cost_df):,} rows")
 
     return po_df, cost_df
@@ -61,20 +63,22 @@ def calculate_open_values(po_df: pd.DataFrame, cost_df: pd.DataFrame) -> pd.Data
     """
     print("Calculating open PO values...")
 
-    # Aggregate cost impact by PO Line ID
-    cost_agg = (
-        cost_df.groupby("PO Line ID")
-        .agg({"Cost Impact Qty": "sum", "Cost Impact Amount": "sum"})
-        .reset_index()
-    )
-    cost_agg.columns = [  # type: ignore[assignment]
-        "PO Line ID",
-        "Total Cost Impact Qty",
-        "Total Cost Impact Amount",
-    ]
-
-    # Merge with PO line items
-    po_df = po_df.merge(cost_agg, on="PO Line ID", how="left")
+    # Aggregate cost impact by PO Line ID (unsorted: the result is joined by key)
+    cost_agg = cost_df.groupby("PO Line ID", sort=False)[
+        ["Cost Impact Qty", "Cost Impact Amount"]
+    ].sum()
+
+    # Left join by position: aggregate keys are unique, so each PO row looks
+    # up its PO Line ID once in the aggregate index (missing IDs get NaN)
+    positions = cost_agg.index.get_indexer(po_df["PO Line ID"])
+    po_df = po_df.reset_index(drop=True)
+    for source_col, total_col in [
+        ("Cost Impact Qty", "Total Cost Impact Qty"),
+        ("Cost Impact Amount", "Total Cost Impact Amount"),
+    ]:
+        po_df[total_col] = pd.api.extensions.take(
+            cost_agg[source_col].to_numpy(), positions, allow_fill=True
+        )
 
     # Fill NaN with 0 for POs with no cost impact yet
     po_df["Total Cost Impact Qty"] = po_df["Total Cost Impact Qty"].fillna(0)
@@ -84,42 +88,31 @@ def calculate_open_values(po_df: pd.DataFrame, cost_df: pd.DataFrame) -> pd.Data
     already_closed = po_df["PO Receipt Status"] == "CLOSED PO"
     not_closed = ~already_closed
 
-    # For already closed POs: set open values to 0
-    po_df.loc[already_closed, "open_po_qty"] = 0
-    po_df.loc[already_closed, "open_po_value"] = 0
+    # Each field is one whole-column expression, selecting the closed-PO value
+    # with where(), instead of masked .loc reads and writes per status
+    ordered_qty = po_df["Ordered Quantity"]
+    po_value = po_df["Purchase Value USD"]
+    total_qty = po_df["Total Cost Impact Qty"]
+    total_amount = po_df["Total Cost Impact Amount"]
 
-    # For non-closed POs: calculate open values
-    po_df.loc[not_closed, "open_po_qty"] = (
-        po_df.loc[not_closed, "Ordered Quantity"]
-        - po_df.loc[not_closed, "Total Cost Impact Qty"]
-    )
-    po_df.loc[not_closed, "open_po_value"] = (
-        po_df.loc[not_closed, "Purchase Value USD"]
-        - po_df.loc[not_closed, "Total Cost Impact Amount"]
-    )
+    # Open values: 0 for already closed POs, ordered - cost impact otherwise
+    po_df["open_po_qty"] = (ordered_qty - total_qty).where(not_closed, 0.0)
+    po_df["open_po_value"] = (po_value - total_amount).where(not_closed, 0.0)
 
     # --- Cost impact pre-computed fields ---
     # For closed POs: cost_impact_value = full PO value, cost_impact_pct = 1.0
-    po_df.loc[already_closed, "cost_impact_value"] = po_df.loc[
-        already_closed, "Purchase Value USD"
-    ]
-    po_df.loc[already_closed, "cost_impact_pct"] = 1.0
-
     # For non-closed POs: cost_impact_value = Total Cost Impact Amount
-    po_df.loc[not_closed, "cost_impact_value"] = po_df.loc[
-        not_closed, "Total Cost Impact Amount"
-    ]
+    po_df["cost_impact_value"] = total_amount.where(not_closed, po_value)
 
     # cost_impact_pct = cost_impact_value / po_value_usd, clamped [0,1]
-    has_po_value = not_closed & (po_df["Purchase Value USD"] > 0)
-    po_df.loc[has_po_value, "cost_impact_pct"] = (
-        po_df.loc[has_po_value, "cost_impact_value"]
-        / po_df.loc[has_po_value, "Purchase Value USD"]
-    ).clip(0, 1)
-
     # Non-closed POs with zero PO value: NULL pct (division undefined)
-    no_po_value = not_closed & ~(po_df["Purchase Value USD"] > 0)
-    po_df.loc[no_po_value, "cost_impact_pct"] = None
+    has_po_value = not_closed & (po_value > 0)
+    po_df["cost_impact_pct"] = (
+        (po_df["cost_impact_value"] / po_value)
+        .clip(0, 1)
+        .where(has_po_value)
+        .where(not_closed, 1.0)
+    )
 
     print(f"  Closed POs (from raw status): {already_closed.sum():,}")
     print(f"  Open POs: {not_closed.sum():,}")
@@ -199,7 +192,7 @@ def calculate_wbs_validated(df: pd.DataFrame) -> pd.DataFrame:
         return df
 
     # Load valid WBS numbers from wbs_details
-    wbs_df = pd.read_csv(WBS_DETAILS_FILE, usecols=["wbs_number"])
+    wbs_df = read_csv(WBS_DETAILS_FILE, columns=["wbs_number"])
     valid_wbs = set(wbs_df["wbs_number"].dropna().unique())
     print(f"  Loaded {len(valid_wbs):,} valid WBS numbers from wbs_details")
 
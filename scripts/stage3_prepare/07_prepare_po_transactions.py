@@ -17,7 +17,8 @@ SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd  # noqa: E402
-from config.column_mappings import PO_TRANSACTIONS_MAPPING  # noqa: E402
+from config.column_mappings import COST_IMPACT_DTYPES, PO_TRANSACTIONS_MAPPING  # noqa: E402
+from utils.intermediates import intermediate_path, read_intermediate  # noqa: E402
 
 # Import Pandera contract for runtime validation (optional dependency)
 try:
@@ -31,14 +32,14 @@ except ImportError:
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-COST_IMPACT_FILE = PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv"
+COST_IMPACT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv")
 OUTPUT_FILE = PROJECT_ROOT / "data" / "import-ready" / "po_transactions.csv"
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
     """Load cost impact data."""
     print(f"Loading data from: {filepath}")
-    df = pd.read_csv(filepath)
+    df = read_intermediate(filepath, dtype=COST_IMPACT_DTYPES)
     print(f"  Loaded {len(df):,} rows")
     return df
 
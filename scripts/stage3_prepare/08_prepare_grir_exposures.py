@@ -18,9 +18,11 @@ sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd  # noqa: E402
 from config.column_mappings import (  # noqa: E402
+    GRIR_EXPOSURES_DTYPES,
     GRIR_EXPOSURES_MAPPING,
     REQUIRED_COLUMNS,
 )
+from utils.intermediates import intermediate_path, read_intermediate  # noqa: E402
 
 # Import Pandera contract for runtime validation (optional dependency)
 try:
@@ -34,14 +36,14 @@ except ImportError:
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "grir_exposures.csv"
+INPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "grir_exposures.csv")
 OUTPUT_FILE = PROJECT_ROOT / "data" / "import-ready" / "grir_exposures.csv"
 
 
 def load_data(filepath: Path) -> pd.DataFrame:
     """Load GRIR exposures data."""
     print(f"Loading data from: {filepath}")
-    df = pd.read_csv(filepath)
+    df = read_intermediate(filepath, dtype=GRIR_EXPOSURES_DTYPES)
     print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
     return df
 
@@ -28,17 +28,18 @@ sys.path.insert(0, str(SCRIPTS_DIR))
 
 import pandas as pd
 from config.column_mappings import WBS_DETAILS_MAPPING
+from utils.intermediates import intermediate_path, read_intermediate
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "wbs_processed.csv"
+INPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "wbs_processed.csv")
 OUTPUT_FILE = PROJECT_ROOT / "data" / "import-ready" / "wbs_details.csv"
 
 
 def load_data() -> pd.DataFrame:
     """Load intermediate WBS data."""
     print("Loading intermediate data...")
-    df = pd.read_csv(INPUT_FILE)
+    df = read_intermediate(INPUT_FILE)
     print(f"  WBS Details: {len(df):,} rows")
     return df
 
@@ -29,17 +29,19 @@ from config.column_mappings import (  # noqa: E402
     REQUIRED_COLUMNS,
     SAP_RESERVATIONS_MAPPING,
 )
+from utils.csv_io import read_csv  # noqa: E402
+from utils.intermediates import intermediate_path, read_intermediate  # noqa: E402
 
 # Paths
 PROJECT_ROOT = SCRIPTS_DIR.parent
-INPUT_FILE = PROJECT_ROOT / "data" / "intermediate" / "reservations.csv"
+INPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "reservations.csv")
 OUTPUT_FILE = PROJECT_ROOT / "data" / "import-ready" / "sap_reservations.csv"
 
 
 def load_data() -> pd.DataFrame:
     """Load intermediate reservations data."""
     print("Loading intermediate data...")
-    df = pd.read_csv(INPUT_FILE)
+    df = read_intermediate(INPUT_FILE, csv_reader=read_csv)
     initial_count = len(df)
     print(f"  Loaded: {initial_count:,} rows")
 
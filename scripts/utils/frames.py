@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+DataFrame Row Selection Utilities for Pipeline Scripts
+
+Filtering with `df[mask].copy()` materializes the kept rows twice (a
+boolean-indexed frame, then its copy). take_rows gathers them once, and
+the result is an independent frame, so later in-place steps do not trigger
+SettingWithCopyWarning.
+
+Usage:
+    from utils.frames import take_rows
+
+    df_filtered = take_rows(df, has_text(df["SAP WBS # / SO #"]))
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def take_rows(df: pd.DataFrame, mask: np.ndarray) -> pd.DataFrame:
+    """Select rows by boolean mask in a single gather (same rows as df[mask].copy())."""
+    return df.take(np.flatnonzero(mask))
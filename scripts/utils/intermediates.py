@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Intermediate File Format Utilities for Pipeline Scripts
+
+The PO / GR / IR / cost impact / GRIR intermediates are CSV by default.
+Setting PIPELINE_INTERMEDIATE_FORMAT=parquet (or running
+`pipeline.py --format parquet`) switches them to zstd-compressed Parquet,
+which avoids re-parsing text and keeps dtypes between scripts.
+import-ready outputs are always CSV.
+
+Note: Parquet keeps the dtypes each script produced, whereas CSV
+re-infers them on read (e.g. a column of numeric-looking strings comes
+back as int64). Readers that depend on specific dtypes should pin them.
+
+When scripts share one interpreter (pipeline.py without --isolated), the
+orchestrator calls enable_read_cache() with the intermediates that several
+scripts read (e.g. PO line items in 05, 06 and the stage3 prepare script),
+so an unchanged file is parsed once. Each caller gets its own copy, so
+results are the same as re-reading the file. Other files are not cached, and
+the orchestrator calls evict_cached_reads() once a file's last reader has
+run, so the cache only holds frames that will be read again.
+
+Usage:
+    from utils.intermediates import intermediate_path, read_intermediate, write_intermediate
+
+    OUTPUT_FILE = intermediate_path(PROJECT_ROOT / "data" / "intermediate" / "cost_impact.csv")
+
+    df = read_intermediate(INPUT_FILE, dtype={"GR Amount": "float64"})
+    write_intermediate(df, OUTPUT_FILE)
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+
+INTERMEDIATE_FORMAT_ENV = "PIPELINE_INTERMEDIATE_FORMAT"
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+# Parsed intermediates keyed by read arguments; None when caching is off.
+# Values are (file signature, DataFrame).
+_read_cache: Optional[dict] = None
+
+# File stems (e.g. "po_line_items") eligible for the read cache
+_cached_names: set[str] = set()
+
+
+def enable_read_cache(names: Iterable[str]) -> None:
+    """
+    Cache parsed intermediates for the rest of this process.
+
+    Args:
+        names: File stems to cache (any format), e.g. "po_line_items" for
+            po_line_items.csv or .parquet; other files are always re-read
+    """
+    global _read_cache
+    if _read_cache is None:
+        _read_cache = {}
+    _cached_names.update(names)
+
+
+def evict_cached_reads(names: Iterable[str]) -> None:
+    """Drop cached frames for these file stems and stop caching them."""
+    names = set(names)
+    _cached_names.difference_update(names)
+    if _read_cache:
+        for key in [key for key in _read_cache if Path(key[0]).stem in names]:
+            del _read_cache[key]
+
+
+def _file_signature(filepath: Path) -> tuple[int, int]:
+    """(mtime_ns, size): changes whenever a script rewrites the file."""
+    stat = filepath.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_intermediate_format() -> str:
+    """Return the configured intermediate format ("csv" unless overridden)."""
+    fmt = os.environ.get(INTERMEDIATE_FORMAT_ENV, "csv").strip().lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"{INTERMEDIATE_FORMAT_ENV}={fmt!r} is not supported (expected one of {SUPPORTED_FORMATS})"
+        )
+    return fmt
+
+
+def intermediate_path(csv_path: Path) -> Path:
+    """Map an intermediate's CSV path to the configured format."""
+    if get_intermediate_format() == "parquet":
+        return csv_path.with_suffix(".parquet")
+    return csv_path
+
+
+def read_intermediate(
+    filepath: Path,
+    columns: Optional[list[str]] = None,
+    dtype: Optional[dict] = None,
+    csv_reader: Callable[..., pd.DataFrame] = pd.read_csv,
+) -> pd.DataFrame:
+    """
+    Read an intermediate file, dispatching on its suffix.
+
+    Args:
+        filepath: Path from intermediate_path()
+        columns: Optional subset of columns to load
+        dtype: Optional dtypes to enforce (applied after load for Parquet)
+        csv_reader: Reader for CSV files (kwargs are only passed when set)
+    """
+    if _read_cache is None or filepath.stem not in _cached_names:
+        return _read_uncached(filepath, columns, dtype, csv_reader)
+
+    key = (
+        str(filepath),
+        tuple(columns) if columns is not None else None,
+        tuple(sorted((col, str(dt)) for col, dt in dtype.items())) if dtype else None,
+        csv_reader,
+    )
+    signature = _file_signature(filepath)
+    cached = _read_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
+    df = _read_uncached(filepath, columns, dtype, csv_reader)
+    # Frames parsed before the file was rewritten will never hit again
+    stale = [
+        other for other, (other_signature, _) in _read_cache.items()
+        if other[0] == key[0] and other_signature != signature
+    ]
+    for other in stale:
+        del _read_cache[other]
+    _read_cache[key] = (signature, df.copy())
+    return df
+
+
+def _read_uncached(
+    filepath: Path,
+    columns: Optional[list[str]],
+    dtype: Optional[dict],
+    csv_reader: Callable[..., pd.DataFrame],
+) -> pd.DataFrame:
+    """Parse an intermediate file (see read_intermediate)."""
+    if filepath.suffix == ".parquet":
+        df = pd.read_parquet(filepath, columns=columns)
+        return df.astype(dtype) if dtype else df
+
+    kwargs: dict = {}
+    if columns is not None:
+        kwargs["usecols"] = columns
+    if dtype is not None:
+        kwargs["dtype"] = dtype
+    return csv_reader(filepath, **kwargs)
+
+
+def _to_arrow_safe_objects(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert mixed-type object columns to text so Arrow can store them.
+
+    Needed for Parquet and for Arrow-based CSV writers (pandas' own CSV
+    writer flattens everything to text anyway); e.g. cost impact "Posting Date"
+    mixes raw date strings (simple POs) with Timestamps (complex POs).
+    """
+    mixed = [
+        col for col in df.columns[df.dtypes == object]
+        if pd.api.types.infer_dtype(df[col], skipna=True) == "mixed"
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_intermediate(df: pd.DataFrame, filepath: Path, csv_writer: Optional[Callable] = None) -> None:
+    """
+    Write an intermediate file, dispatching on its suffix.
+
+    Args:
+        df: DataFrame to write (index is not written)
+        filepath: Path from intermediate_path()
+        csv_writer: Optional writer(df, filepath) for CSV (e.g. utils.csv_io.write_csv);
+            defaults to DataFrame.to_csv
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    if filepath.suffix == ".parquet":
+        _to_arrow_safe_objects(df).to_parquet(filepath, index=False, compression="zstd")
+    elif csv_writer is not None:
+        csv_writer(_to_arrow_safe_objects(df), filepath)
+    else:
+        df.to_csv(filepath, index=False)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Text Value Utilities for Pipeline Scripts
+
+Dashboard exports mark "no value" either as an empty cell (NaN) or as a
+blank / whitespace-only string. The WBS extraction scripts treat both as
+missing.
+
+Usage:
+    from utils.text import has_text
+
+    mask = has_text(df["SAP WBS # / SO #"])
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def has_text(values: pd.Series) -> np.ndarray:
+    """
+    Boolean mask of values that are present and not blank.
+
+    Same result as values.notna() & (values.astype(str).str.strip() != ""),
+    but each distinct value is checked once and no per-row strings are built.
+    Non-string values (e.g. numbers) count as present.
+    """
+    codes, uniques = pd.factorize(values)
+    is_present = np.fromiter(
+        (not (isinstance(v, str) and not v.strip()) for v in uniques),
+        dtype=bool,
+        count=len(uniques),
+    )
+    # Code -1 (missing) picks the trailing False
+    return np.append(is_present, False)[codes]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit Price Lookup Utilities for Pipeline Scripts
+
+The GR and IR cleaning scripts both need a PO Line ID -> Unit Price lookup
+derived from the intermediate PO line items. Rather than re-parsing the full
+CSV and re-computing the division in each script, 01_po_line_items.py writes
+a two-column Parquet sidecar next to its CSV output.
+
+Sidecar Validation Checks:
+1. Sidecar file must exist
+2. Sidecar mtime must be >= the PO line items CSV mtime
+   (a later rewrite of the CSV, e.g. by enrichment, invalidates it)
+3. A Parquet engine (pyarrow) must be importable
+
+If any check fails, the lookup is rebuilt from the CSV, so the sidecar is a
+pure optimization and never changes results.
+
+Usage:
+    from utils.unit_prices import load_unit_price_lookup, write_unit_price_sidecar
+
+    # Producer (01_po_line_items.py), after writing the CSV
+    write_unit_price_sidecar(df, OUTPUT_FILE)
+
+    # Consumers (02_gr_postings.py, 03_ir_postings.py)
+    unit_price_lookup = load_unit_price_lookup(PO_LINE_ITEMS_FILE)
+    positions = get_lookup_positions(unit_price_lookup, df["PO Line ID"])
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.intermediates import read_intermediate
+
+UNIT_PRICE_COLUMNS = ["PO Line ID", "Unit Price"]
+
+# Only the columns needed to derive unit prices are parsed from the CSV
+PO_PRICE_SOURCE_DTYPES = {
+    "PO Line ID": "string",
+    "Purchase Value USD": "float64",
+    "Ordered Quantity": "float64",
+}
+
+
+def get_sidecar_path(po_line_items_file: Path) -> Path:
+    """Return the unit price sidecar path for a PO line items CSV."""
+    return po_line_items_file.with_suffix(".unit_price.parquet")
+
+
+def compute_unit_prices(po_df: pd.DataFrame) -> np.ndarray:
+    """
+    Unit Price = Purchase Value USD / Ordered Quantity, per PO row.
+
+    Rows with a zero Ordered Quantity get 0 rather than inf/NaN, which would
+    otherwise carry into every GR, IR and cost impact amount of the line.
+    """
+    value = po_df["Purchase Value USD"].to_numpy(dtype="float64")
+    qty = po_df["Ordered Quantity"].to_numpy(dtype="float64")
+    return np.divide(value, qty, out=np.zeros_like(value), where=qty != 0)
+
+
+def build_unit_price_lookup(po_df: pd.DataFrame) -> pd.Series:
+    """
+    Build the PO Line ID -> Unit Price lookup (see compute_unit_prices).
+
+    Every consumer (GR/IR amounts, cost impact, GRIR exposures) prices
+    through this one lookup, so a PO Line ID is priced the same everywhere.
+    The last row wins for duplicate PO Line IDs, as in a dict built from the
+    rows.
+    """
+    unit_price = compute_unit_prices(po_df)
+    lookup = pd.Series(unit_price, index=po_df["PO Line ID"].to_numpy(), name="Unit Price")
+    lookup.index.name = "PO Line ID"
+    return lookup[~lookup.index.duplicated(keep="last")]
+
+
+def write_unit_price_sidecar(po_df: pd.DataFrame, po_line_items_file: Path) -> None:
+    """
+    Write the unit price sidecar next to the PO line items CSV.
+
+    Must be called after the CSV is written so the sidecar is not older than
+    it. Skipped (with a note) if no Parquet engine is installed.
+    """
+    sidecar = get_sidecar_path(po_line_items_file)
+    lookup = build_unit_price_lookup(po_df)
+    try:
+        lookup.reset_index().to_parquet(sidecar, index=False, compression="zstd")
+    except ImportError:
+        print("  Note: pyarrow not installed, skipping unit price sidecar")
+        return
+    print(f"  Saved unit price sidecar: {sidecar.name}")
+
+
+def is_sidecar_fresh(po_line_items_file: Path) -> bool:
+    """Check if the sidecar exists and is not older than the PO line items CSV."""
+    sidecar = get_sidecar_path(po_line_items_file)
+    if not sidecar.exists():
+        return False
+    return sidecar.stat().st_mtime >= po_line_items_file.stat().st_mtime
+
+
+def load_unit_price_lookup(po_line_items_file: Path) -> pd.Series:
+    """
+    Load the PO Line ID -> Unit Price lookup.
+
+    Reads the Parquet sidecar when fresh, otherwise falls back to reading the
+    PO line items intermediate (CSV or Parquet).
+    """
+    if is_sidecar_fresh(po_line_items_file):
+        sidecar = get_sidecar_path(po_line_items_file)
+        try:
+            # Via read_intermediate so GR and IR share one parse when run in-process
+            lookup_df = read_intermediate(sidecar, columns=UNIT_PRICE_COLUMNS)
+        except ImportError:
+            pass
+        else:
+            print(f"  Loading unit prices from sidecar: {sidecar.name}")
+            return lookup_df.set_index("PO Line ID")["Unit Price"]
+
+    print(f"  Loading unit prices from: {po_line_items_file}")
+    po_df = read_intermediate(
+        po_line_items_file,
+        columns=list(PO_PRICE_SOURCE_DTYPES),
+        dtype=PO_PRICE_SOURCE_DTYPES,
+    )
+    return build_unit_price_lookup(po_df)
+
+
+def get_lookup_positions(unit_price_lookup: pd.Series, keys: pd.Series) -> np.ndarray:
+    """
+    Return the lookup position for each key (-1 where the PO Line ID is unknown).
+
+    Postings repeat PO Line IDs many times, so keys are factorized first and
+    only the distinct IDs are hashed against the lookup index; rows then map
+    through integer codes. NaN keys are kept as a value (not a sentinel) so
+    they match exactly as in a merge.
+    """
+    codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+    return unit_price_lookup.index.get_indexer(uniques)[codes]
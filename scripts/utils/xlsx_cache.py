@@ -31,6 +31,11 @@ Usage:
     # ... process xlsx ...
 
     cache.save_metadata()
+
+Reading xlsx: pass EXCEL_ENGINE to pd.read_excel. It is "calamine" (the
+Rust-based python-calamine reader) when installed, else None so pandas
+falls back to openpyxl (which pandas already opens with read_only=True and
+data_only=True, i.e. streamed cell values and cached formula results).
 """
 
 import hashlib
@@ -40,6 +45,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Rust-based xlsx reader (optional dependency); falls back to openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
 
 @dataclass
 class CacheMetadata:
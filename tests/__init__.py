@@ -3,4 +3,7 @@ Test package for cost-management-db.
 
 Contains:
 - test_pipeline_golden_set.py: Golden set tests for pipeline validation
+- test_calculate_cost_impact.py: Cost impact routing and walk vs. the original per-group logic
+- test_calculate_grir.py: GRIR exposure walk vs. the original per-group logic
+- helpers.py: Loading stage scripts (numeric-prefixed file names) as modules
 """
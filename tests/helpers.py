@@ -0,0 +1,22 @@
+"""
+Shared helpers for pipeline script tests.
+
+Stage scripts are named with numeric prefixes (e.g. 06_calculate_grir.py),
+so they cannot be imported with a plain import statement.
+"""
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+
+
+def load_script(relative_path: str) -> ModuleType:
+    """Import a pipeline script by its path relative to scripts/."""
+    path = SCRIPTS_DIR / relative_path
+    module_name = "pipeline_" + path.stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
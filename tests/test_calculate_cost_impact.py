@@ -0,0 +1,195 @@
+"""
+Cost Impact Calculation Tests
+
+calculate_complex_cost_impact walks postings as one sorted run per PO Line
+ID. These tests pin its output to the original per-group iterrows logic
+(reference_complex_cost_impact below), including Python round/max behavior
+with NaN quantities, and check the simple/complex routing.
+
+Run: pytest tests/test_calculate_cost_impact.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.helpers import load_script
+
+cost_impact = load_script("stage2_transform/05_calculate_cost_impact.py")
+
+
+def reference_complex_cost_impact(
+    gr_df: pd.DataFrame,
+    ir_df: pd.DataFrame,
+    complex_po_ids: set,
+    unit_prices: dict,
+) -> pd.DataFrame:
+    """The original groupby/iterrows implementation, kept as the oracle."""
+    complex_gr = gr_df[gr_df["PO Line ID"].isin(complex_po_ids)].rename(columns={
+        "GR Posting Date": "Posting Date",
+        "GR Effective Quantity": "Posting Qty",
+        "GR Amount": "Posting Amount",
+    })
+    complex_gr["Posting Type"] = "GR"
+    complex_ir = ir_df[ir_df["PO Line ID"].isin(complex_po_ids)].rename(columns={
+        "Invoice Posting Date": "Posting Date",
+        "IR Effective Quantity": "Posting Qty",
+        "Invoice Amount": "Posting Amount",
+    })
+    complex_ir["Posting Type"] = "IR"
+
+    combined = pd.concat([complex_gr, complex_ir], ignore_index=True)
+    combined["Posting Date"] = pd.to_datetime(combined["Posting Date"])
+    combined = combined.sort_values(["PO Line ID", "Posting Date", "Posting Type"])
+
+    results = []
+    for po_line_id, group in combined.groupby("PO Line ID"):
+        cumulative_gr = 0
+        cumulative_ir = 0
+        last_cumulative = 0
+        unit_price = unit_prices.get(po_line_id, 0)
+        for _, row in group.iterrows():
+            posting_type = row["Posting Type"]
+            posting_qty = row["Posting Qty"]
+            if posting_type == "GR":
+                cumulative_gr += posting_qty
+                reference = cumulative_gr if cumulative_gr >= cumulative_ir else max(cumulative_gr, cumulative_ir)
+            else:
+                cumulative_ir += posting_qty
+                reference = cumulative_ir if cumulative_ir >= cumulative_gr else max(cumulative_gr, cumulative_ir)
+            cost_impact_qty = reference - last_cumulative
+            last_cumulative += cost_impact_qty
+            results.append({
+                "PO Line ID": po_line_id,
+                "Posting Date": row["Posting Date"],
+                "Posting Type": posting_type,
+                "Posting Qty": posting_qty,
+                "Cost Impact Qty": cost_impact_qty,
+                "Cost Impact Amount": round(cost_impact_qty * unit_price, 2),
+            })
+    return pd.DataFrame(results)
+
+
+@pytest.fixture
+def po_df():
+    """PO line items: P1 is simple (GLD + K), the rest are complex."""
+    return pd.DataFrame({
+        "PO Line ID": ["P1", "C1", "C2", "C3"],
+        "Main Vendor SLB Vendor Category": ["GLD", "GLD", "3PS", "3PS"],
+        "PO Account Assignment Category": ["K", "F", "K", "P"],
+        "Purchase Value USD": [100.0, 250.0, 99.99, 30.0],
+        "Ordered Quantity": [10.0, 10.0, 3.0, 4.0],
+    })
+
+
+@pytest.fixture
+def postings():
+    """
+    GR/IR postings for the complex walk.
+
+    - C1: GR ahead of IR, then IR catches up (several postings)
+    - C2: a NaN GR quantity (NaN propagates through the running totals)
+    - C3: IR before GR on the same date
+    - X1: complex ID with no PO row, so no unit price (amounts of 0)
+    - P1: simple PO (its IR is ignored)
+    - a null PO Line ID (skipped)
+    """
+    gr_df = pd.DataFrame({
+        "PO Line ID": ["C1", "C1", "C2", "C2", "C3", "X1", "P1", np.nan],
+        "GR Posting Date": [
+            "2025-01-05", "2025-02-01", "2025-01-01", "2025-01-03",
+            "2025-03-01", "2025-01-01", "2025-01-01", "2025-01-01",
+        ],
+        "GR Effective Quantity": [4.0, 3.0, np.nan, 1.0, 2.0, 5.0, 6.0, 1.0],
+        "GR Amount": [100.0, 75.0, np.nan, 33.33, 15.0, 0.0, 60.0, 1.0],
+    })
+    ir_df = pd.DataFrame({
+        "PO Line ID": ["C1", "C1", "C2", "C3", "C3", "X1", "P1", np.nan],
+        "Invoice Posting Date": [
+            "2025-01-10", "2025-03-01", "2025-01-02", "2025-03-01",
+            "2025-02-01", "2025-01-02", "2025-01-01", "2025-01-01",
+        ],
+        "IR Effective Quantity": [2.0, 6.0, 2.0, 1.5, 0.5, 7.0, 9.0, 1.0],
+        "Invoice Amount": [50.0, 150.0, 66.66, 11.25, 3.75, 0.0, 90.0, 1.0],
+    })
+    return gr_df, ir_df
+
+
+def run_both(po_df, gr_df, ir_df, complex_ids):
+    """Return (new, reference) complex cost impact for the same postings."""
+    unit_prices = (
+        po_df.set_index("PO Line ID")["Purchase Value USD"]
+        / po_df.set_index("PO Line ID")["Ordered Quantity"]
+    ).to_dict()
+    result = cost_impact.calculate_complex_cost_impact(
+        gr_df, ir_df, pd.Series(complex_ids, dtype=object), po_df.copy()
+    )
+    expected = reference_complex_cost_impact(gr_df, ir_df, set(complex_ids), unit_prices)
+    return result, expected
+
+
+class TestClassifyPoLineItems:
+    """Simple = GLD vendor with K/P/S/V account assignment; complex = the rest."""
+
+    def test_routing(self, po_df):
+        simple_ids, complex_ids = cost_impact.classify_po_line_items(po_df)
+        assert simple_ids.tolist() == ["P1"]
+        assert complex_ids.tolist() == ["C1", "C2", "C3"]
+
+
+class TestCalculateSimpleCostImpact:
+    """Simple POs take GR postings as-is and ignore IR."""
+
+    def test_gr_only(self, postings):
+        gr_df, _ = postings
+        result = cost_impact.calculate_simple_cost_impact(gr_df, pd.Series(["P1"]))
+        assert result["PO Line ID"].tolist() == ["P1"]
+        assert result["Posting Type"].tolist() == ["GR"]
+        assert result["Cost Impact Qty"].tolist() == [6.0]
+        assert result["Cost Impact Amount"].tolist() == [60.0]
+
+
+class TestCalculateComplexCostImpact:
+    """calculate_complex_cost_impact matches the original per-group logic."""
+
+    COMPLEX_IDS = ["C1", "C2", "C3", "X1", np.nan]
+
+    def test_matches_reference(self, po_df, postings):
+        result, expected = run_both(po_df, *postings, self.COMPLEX_IDS)
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+    def test_cost_impact_follows_larger_of_gr_and_ir(self, po_df, postings):
+        result, _ = run_both(po_df, *postings, self.COMPLEX_IDS)
+        c1 = result[result["PO Line ID"] == "C1"]
+        # GR 4, IR 2, GR 3, IR 6 -> max(GR, IR) = 4, 4, 7, 8
+        assert c1["Cost Impact Qty"].tolist() == [4.0, 0.0, 3.0, 1.0]
+        assert c1["Cost Impact Amount"].tolist() == [100.0, 0.0, 75.0, 25.0]
+        assert c1["Cost Impact Qty"].sum() == 8.0
+
+    def test_nan_quantity_propagates(self, po_df, postings):
+        result, _ = run_both(po_df, *postings, self.COMPLEX_IDS)
+        c2 = result[result["PO Line ID"] == "C2"]
+        assert c2["Posting Type"].tolist() == ["GR", "IR", "GR"]
+        assert c2["Cost Impact Qty"].isna().all()
+
+    def test_same_date_gr_before_ir(self, po_df, postings):
+        result, _ = run_both(po_df, *postings, self.COMPLEX_IDS)
+        c3 = result[result["PO Line ID"] == "C3"]
+        assert c3["Posting Type"].tolist() == ["IR", "GR", "IR"]
+        assert c3["Cost Impact Qty"].tolist() == [0.5, 1.5, 0.0]
+
+    def test_missing_unit_price_values_at_zero(self, po_df, postings):
+        result, _ = run_both(po_df, *postings, self.COMPLEX_IDS)
+        x1 = result[result["PO Line ID"] == "X1"]
+        assert x1["Cost Impact Qty"].tolist() == [5.0, 2.0]
+        assert x1["Cost Impact Amount"].tolist() == [0.0, 0.0]
+
+    def test_simple_and_null_ids_excluded(self, po_df, postings):
+        result, _ = run_both(po_df, *postings, self.COMPLEX_IDS)
+        assert set(result["PO Line ID"]) == {"C1", "C2", "C3", "X1"}
+
+    def test_no_postings(self, po_df, postings):
+        gr_df, ir_df = postings
+        result = cost_impact.calculate_complex_cost_impact(
+            gr_df.iloc[:0], ir_df.iloc[:0], pd.Series(self.COMPLEX_IDS), po_df.copy()
+        )
+        assert len(result) == 0
@@ -0,0 +1,220 @@
+"""
+GRIR Exposure Calculation Tests
+
+calculate_grir_exposures walks postings as one sorted run per PO Line ID.
+These tests pin its output to the original per-group iterrows logic
+(reference_grir_exposures below) on small hand-built GR/IR frames.
+
+Run: pytest tests/test_calculate_grir.py -v
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.helpers import load_script
+
+grir = load_script("stage2_transform/06_calculate_grir.py")
+
+SNAPSHOT_DATE = date(2026, 1, 31)
+
+
+def reference_grir_exposures(
+    gr_df: pd.DataFrame,
+    ir_df: pd.DataFrame,
+    simple_po_ids: set,
+    unit_prices: dict,
+    snapshot_date: date,
+) -> pd.DataFrame:
+    """The original groupby/iterrows implementation, kept as the oracle."""
+    simple_gr = gr_df[gr_df["PO Line ID"].isin(simple_po_ids)].rename(columns={
+        "GR Posting Date": "Posting Date",
+        "GR Effective Quantity": "Posting Qty",
+    })
+    simple_gr["Posting Type"] = "GR"
+    simple_ir = ir_df[ir_df["PO Line ID"].isin(simple_po_ids)].rename(columns={
+        "Invoice Posting Date": "Posting Date",
+        "IR Effective Quantity": "Posting Qty",
+    })
+    simple_ir["Posting Type"] = "IR"
+    columns = ["PO Line ID", "Posting Date", "Posting Type", "Posting Qty"]
+
+    combined = pd.concat([simple_gr[columns], simple_ir[columns]], ignore_index=True)
+    combined["Posting Date"] = pd.to_datetime(combined["Posting Date"])
+    combined = combined.sort_values(["PO Line ID", "Posting Date", "Posting Type"])
+
+    results = []
+    for po_line_id, group in combined.groupby("PO Line ID"):
+        cumulative_gr = 0.0
+        cumulative_ir = 0.0
+        first_exposure_date = None
+        for _, row in group.iterrows():
+            if row["Posting Type"] == "GR":
+                cumulative_gr += float(row["Posting Qty"])
+            else:
+                cumulative_ir += float(row["Posting Qty"])
+            if cumulative_ir > cumulative_gr and first_exposure_date is None:
+                first_exposure_date = row["Posting Date"]
+            if cumulative_gr >= cumulative_ir:
+                first_exposure_date = None
+
+        grir_qty = cumulative_ir - cumulative_gr
+        if grir_qty > 0:
+            if first_exposure_date is not None:
+                days_open = (pd.Timestamp(snapshot_date) - first_exposure_date).days
+            else:
+                days_open = 0
+            time_bucket = grir.GRIR_TIME_BUCKET_MAX
+            for threshold, bucket in sorted(grir.GRIR_TIME_BUCKETS.items()):
+                if days_open <= threshold:
+                    time_bucket = bucket
+                    break
+            results.append({
+                "PO Line ID": po_line_id,
+                "GRIR Qty": round(grir_qty, 4),
+                "GRIR Value": round(grir_qty * unit_prices.get(po_line_id, 0), 2),
+                "First Exposure Date": first_exposure_date.strftime("%Y-%m-%d") if first_exposure_date else None,
+                "Days Open": days_open,
+                "Time Bucket": time_bucket,
+                "Snapshot Date": snapshot_date.strftime("%Y-%m-%d"),
+            })
+    return pd.DataFrame(results)
+
+
+def make_postings(rows: list, date_col: str, qty_col: str) -> pd.DataFrame:
+    """Build a GR or IR postings frame from (PO Line ID, date, qty) tuples."""
+    return pd.DataFrame(rows, columns=["PO Line ID", date_col, qty_col])
+
+
+@pytest.fixture
+def postings():
+    """
+    GR/IR postings covering the walk's edge cases.
+
+    - A: exposure returns to 0, then reopens (first exposure resets)
+    - B: open exposure across several postings
+    - C: GR ahead of IR (no exposure)
+    - D: a GR with no posting date (sorts last within the PO)
+    - E: IR and GR on the same date, IR listed first in the source
+    - F: exposure with no unit price (valued at 0)
+    - null PO Line IDs (skipped, even when listed as simple)
+    - Z: not a simple PO (ignored)
+    """
+    gr_df = make_postings([
+        ("A", "2025-02-01", 5.0),
+        ("B", "2025-06-15", 4.0),
+        ("C", "2025-05-01", 10.0),
+        ("D", None, 2.0),
+        ("E", "2025-10-01", 5.0),
+        (np.nan, "2025-01-01", 1.0),
+        ("Z", "2025-01-01", 1.0),
+    ], "GR Posting Date", "GR Effective Quantity")
+    ir_df = make_postings([
+        ("E", "2025-10-01", 5.0),
+        ("A", "2025-01-01", 5.0),
+        ("A", "2025-03-01", 3.0),
+        ("B", "2025-06-01", 10.0),
+        ("B", "2025-07-01", 0.1),
+        ("B", "2025-07-01", 0.2),
+        ("C", "2025-05-02", 5.0),
+        ("D", "2025-09-01", 8.0),
+        ("E", "2025-11-01", 1.0),
+        ("F", "2025-12-20", 2.5),
+        (np.nan, "2025-01-01", 7.0),
+        ("Z", "2025-01-01", 9.0),
+    ], "Invoice Posting Date", "IR Effective Quantity")
+    simple_ids = ["A", "B", "C", "D", "E", "F", np.nan]
+    unit_prices = {"A": 10.0, "B": 2.5, "C": 1.0, "D": 3.333, "E": 7.0, "Z": 1.0}
+    return gr_df, ir_df, simple_ids, unit_prices
+
+
+def run_both(gr_df, ir_df, simple_ids, unit_prices):
+    """Return (new, reference) results for the same postings."""
+    result = grir.calculate_grir_exposures(
+        gr_df, ir_df, pd.Series(simple_ids, dtype=object),
+        pd.Series(unit_prices, dtype="float64"), SNAPSHOT_DATE,
+    )
+    expected = reference_grir_exposures(
+        gr_df, ir_df, set(simple_ids), unit_prices, SNAPSHOT_DATE
+    )
+    return result, expected
+
+
+class TestCalculateGrirExposures:
+    """calculate_grir_exposures matches the original per-group logic."""
+
+    def test_matches_reference(self, postings):
+        result, expected = run_both(*postings)
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+    def test_exposed_ids(self, postings):
+        result, _ = run_both(*postings)
+        assert result["PO Line ID"].tolist() == ["A", "B", "D", "E", "F"]
+
+    def test_first_exposure_resets_when_gr_catches_up(self, postings):
+        result, _ = run_both(*postings)
+        row = result.set_index("PO Line ID").loc["A"]
+        assert row["GRIR Qty"] == 3.0
+        assert row["First Exposure Date"] == "2025-03-01"
+        assert row["GRIR Value"] == 30.0
+
+    def test_missing_posting_date_sorts_last(self, postings):
+        result, _ = run_both(*postings)
+        row = result.set_index("PO Line ID").loc["D"]
+        assert row["GRIR Qty"] == 6.0
+        assert row["First Exposure Date"] == "2025-09-01"
+
+    def test_same_date_gr_before_ir(self, postings):
+        result, _ = run_both(*postings)
+        row = result.set_index("PO Line ID").loc["E"]
+        assert row["GRIR Qty"] == 1.0
+        assert row["First Exposure Date"] == "2025-11-01"
+
+    def test_unknown_unit_price_values_at_zero(self, postings):
+        result, _ = run_both(*postings)
+        row = result.set_index("PO Line ID").loc["F"]
+        assert row["GRIR Qty"] == 2.5
+        assert row["GRIR Value"] == 0.0
+
+    def test_null_ids_skipped(self, postings):
+        result, _ = run_both(*postings)
+        assert result["PO Line ID"].notna().all()
+
+    def test_no_postings(self, postings):
+        gr_df, ir_df, simple_ids, unit_prices = postings
+        result, expected = run_both(gr_df.iloc[:0], ir_df.iloc[:0], simple_ids, unit_prices)
+        assert len(result) == 0
+        assert len(expected) == 0
+
+
+class TestSortPostings:
+    """sort_postings orders rows exactly as the original sort_values did."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_sort_values(self, seed):
+        rng = np.random.default_rng(seed)
+        n = 500
+        posting_date = pd.Series(
+            pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 4, n), "D")
+        )
+        posting_date[rng.random(n) < 0.1] = pd.NaT
+        combined = pd.DataFrame({
+            # Few distinct IDs, dates and types, so most rows tie on all keys
+            "PO Line ID": rng.choice(["4500-10", "4500-2", "4500-1", "B-1", "a-1"], n),
+            "Posting Date": posting_date,
+            "Posting Type": rng.choice(["GR", "IR"], n),
+            "Posting Qty": np.arange(n, dtype="float64"),
+        })
+        expected = combined.sort_values(["PO Line ID", "Posting Date", "Posting Type"])
+        pd.testing.assert_frame_equal(grir.sort_postings(combined), expected)
+
+    def test_missing_dates_last_and_gr_before_ir(self):
+        combined = pd.DataFrame({
+            "PO Line ID": ["B", "A", "A", "A", "A"],
+            "Posting Date": pd.to_datetime([None, None, "2025-01-02", "2025-01-02", "2025-01-01"]),
+            "Posting Type": ["IR", "GR", "IR", "GR", "IR"],
+            "Posting Qty": [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        result = grir.sort_postings(combined)
+        assert result.index.tolist() == [4, 3, 2, 1, 0]